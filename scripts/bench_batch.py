@@ -0,0 +1,94 @@
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+import numpy as np
+
+from utils.batch import calculate_batch
+from utils.calcula import calculate
+
+
+def make_notes(n_notes: int, assets_per_note: int, seed: int = 42) -> list:
+    """
+    Generates random notes in the `calculate` argument format.
+
+    Args:
+        n_notes (int): Number of notes to generate.
+        assets_per_note (int): Number of assets in each note.
+        seed (int): Seed for the random generator, for reproducible runs.
+
+    Returns:
+        list: List of ``(tickers, values, total_grade)`` tuples.
+    """
+    rng = random.Random(seed)
+    notes = []
+    for _ in range(n_notes):
+        tickers = [f"T{i:04d}" for i in range(assets_per_note)]
+        values = [round(rng.uniform(10, 10_000), 2) for _ in tickers]
+        total_grade = round(sum(values) + rng.uniform(0, 50), 2)
+        notes.append((tickers, values, total_grade))
+    return notes
+
+
+def to_columns(notes: list) -> tuple:
+    """
+    Flattens notes into the columnar layout expected by `calculate_batch`.
+
+    Args:
+        notes (list): List of ``(tickers, values, total_grade)`` tuples.
+
+    Returns:
+        tuple: ``(note_ids, values, total_grades)`` NumPy arrays.
+    """
+    note_ids = np.repeat(np.arange(len(notes)), [len(note[1]) for note in notes])
+    values = np.fromiter((v for note in notes for v in note[1]), dtype=np.float64)
+    total_grades = np.array([note[2] for note in notes], dtype=np.float64)
+    return note_ids, values, total_grades
+
+
+def main() -> None:
+    """
+    Compares `calculate_batch` against a Python loop over `calculate`.
+
+    Example:
+        Run via command line:
+        `$ python scripts/bench_batch.py --notes 100000 --assets 4`
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the vectorized batch engine against the scalar loop."
+    )
+    parser.add_argument("--notes", type=int, default=100_000, help="Number of notes")
+    parser.add_argument("--assets", type=int, default=4, help="Assets per note")
+    args = parser.parse_args()
+
+    notes = make_notes(args.notes, args.assets)
+    note_ids, values, total_grades = to_columns(notes)
+
+    start = time.perf_counter()
+    scalar = [calculate(*note) for note in notes]
+    scalar_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = calculate_batch(note_ids, values, total_grades)
+    batch_elapsed = time.perf_counter() - start
+
+    scalar_costs = np.fromiter(
+        (row["cost"] for result in scalar for row in result.values()), dtype=np.float64
+    )
+    max_diff = float(np.max(np.abs(scalar_costs - batch["cost"])))
+
+    rows = len(values)
+    print(f"notes: {args.notes}  rows: {rows}")
+    print(f"scalar loop : {scalar_elapsed:8.3f} s  ({rows / scalar_elapsed:,.0f} rows/s)")
+    print(f"batch       : {batch_elapsed:8.3f} s  ({rows / batch_elapsed:,.0f} rows/s)")
+    print(f"speedup     : {scalar_elapsed / batch_elapsed:8.1f}x")
+    print(f"max |diff|  : {max_diff:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from utils.brl import format_brl, format_brl_many, parse_brl_many
+from utils.calcula import calculate, calculate_compact
+
+CALCULATE_SIZES = (10, 1_000, 100_000, 1_000_000)
+DEFAULT_THRESHOLD = 0.25
+# Characters that end a part of a case name, e.g. "calculate[cents]/1000".
+CASE_SEPARATORS = "[]/."
+
+
+def make_note(size: int, seed: int = 42) -> tuple:
+    """
+    Generates a random note with ``size`` assets.
+
+    Args:
+        size (int): Number of assets.
+        seed (int): Seed for the random generator, for reproducible runs.
+
+    Returns:
+        tuple: ``(tickers, values, total_grade)`` ready for `calculate`.
+    """
+    rng = random.Random(seed)
+    tickers = [f"T{i:07d}" for i in range(size)]
+    values = [round(rng.uniform(10, 10_000), 2) for _ in tickers]
+    return tickers, values, round(sum(values) + rng.uniform(0, size), 2)
+
+
+def time_case(func, repeat: int) -> float:
+    """
+    Times ``func`` and returns the best time per call.
+
+    Fast cases are looped (as chosen by `timeit.Timer.autorange`) so each
+    measurement lasts long enough to be stable.
+
+    Args:
+        func (callable): Zero-argument function to time.
+        repeat (int): Number of measurements; the fastest is kept.
+
+    Returns:
+        float: Best wall-clock time per call, in seconds.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def case_matches(name: str, name_filter: str) -> bool:
+    """
+    Tells whether a case is selected by ``--filter``.
+
+    A filter selects the case with exactly that name, or the cases whose
+    name starts with it followed by a separator, so ``calculate`` selects
+    ``calculate[float]/10`` but not ``calculate_compact[float]/10``, and
+    ``calculate[float]/10`` does not select ``calculate[float]/1000``.
+
+    Args:
+        name (str): Case name.
+        name_filter (str): The filter; empty selects every case.
+
+    Returns:
+        bool: True if the case should run.
+    """
+    if not name_filter or name == name_filter:
+        return True
+    return name.startswith(name_filter) and (
+        name[len(name_filter)] in CASE_SEPARATORS or name_filter[-1] in CASE_SEPARATORS
+    )
+
+
+def build_cases(sizes: tuple, scale: int, chart_scale: int, name_filter: str = "") -> dict:
+    """
+    Builds the benchmark cases, skipping the ones whose dependencies are missing.
+
+    Only cases selected by ``name_filter`` (see `case_matches`) are built, so a
+    filtered run does not generate the datasets (up to a 1M-asset note) of
+    the other cases.
+
+    Args:
+        sizes (tuple): Note sizes for the `calculate` cases.
+        scale (int): Number of elements for the formatting and parsing cases.
+        chart_scale (int): Number of assets for the chart data case.
+        name_filter (str): Case name or name prefix; empty builds all.
+
+    Returns:
+        dict: Mapping of case name to ``(func, n)``.
+    """
+    def wanted(*names) -> bool:
+        return any(case_matches(name, name_filter) for name in names)
+
+    cases = {}
+    for size in sizes:
+        names = {
+            (engine, mode): f"{engine.__name__}[{mode}]/{size}"
+            for engine in (calculate, calculate_compact)
+            for mode in ("float", "cents")
+        }
+        if not wanted(*names.values()):
+            continue
+        note = make_note(size)
+        for (engine, mode), name in names.items():
+            if wanted(name):
+                cases[name] = (lambda note=note, engine=engine, mode=mode: engine(*note, mode=mode), size)
+
+    scale_names = [
+        f"{name}/{scale}"
+        for name in ("format_brl", "format_brl_many", "parse_brl_many", "calculate_batch",
+                     "FloatPromptBR.process_response")
+    ]
+    if wanted(*scale_names):
+        amounts = make_note(scale)[1]
+        texts = [text[3:] for text in format_brl_many(amounts)]
+        scale_cases = {
+            f"format_brl/{scale}": lambda: [format_brl(value) for value in amounts],
+            f"format_brl_many/{scale}": lambda: format_brl_many(amounts),
+            f"parse_brl_many/{scale}": lambda: parse_brl_many(texts),
+        }
+        cases.update((name, (func, scale)) for name, func in scale_cases.items() if wanted(name))
+
+    if wanted(f"calculate_batch/{scale}"):
+        try:
+            import numpy as np
+            from utils.batch import calculate_batch
+        except ImportError:
+            print("skipping calculate_batch: numpy is not installed", file=sys.stderr)
+        else:
+            note_ids = np.arange(scale) // 4
+            totals = np.bincount(note_ids, weights=amounts) + 10.0
+            cases[f"calculate_batch/{scale}"] = (lambda: calculate_batch(note_ids, amounts, totals), scale)
+
+    if wanted(f"FloatPromptBR.process_response/{scale}"):
+        try:
+            from utils.prompts import FloatPromptBR
+        except ImportError:
+            print("skipping FloatPromptBR: rich is not installed", file=sys.stderr)
+        else:
+            prompt = FloatPromptBR("valor")
+            cases[f"FloatPromptBR.process_response/{scale}"] = (
+                lambda: [prompt.process_response(text) for text in texts], scale
+            )
+
+    if wanted(f"build_chart_data/{chart_scale}"):
+        try:
+            from generate_chart import build_chart_data
+        except ImportError as exc:
+            print(f"skipping build_chart_data: {exc}", file=sys.stderr)
+        else:
+            tickers, values, total_grade = make_note(chart_scale)
+            data = {
+                "custo_total": total_grade - sum(values),
+                "items": [{"ticker": t, "valor": v} for t, v in zip(tickers, values)],
+            }
+            cases[f"build_chart_data/{chart_scale}"] = (lambda: build_chart_data(data), chart_scale)
+
+    return cases
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Compares results against a baseline run.
+
+    Args:
+        results (dict): Case name to measurement, as written by this script.
+        baseline (dict): The ``results`` section of a previous run.
+        threshold (float): Allowed slowdown ratio, e.g. 0.25 for 25%.
+
+    Returns:
+        list: Messages for every case slower than the baseline by more than
+              the threshold. Cases missing on either side are ignored.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["seconds"]
+        after = result["seconds"]
+        if before > 0 and after > before * (1 + threshold):
+            regressions.append(f"{name}: {before:.6f} s -> {after:.6f} s (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command-line arguments for the benchmark suite.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the calculator hot paths.")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this path")
+    parser.add_argument("--baseline", type=Path, help="Compare against a previous JSON results file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown vs. baseline before failing (default: 0.25)")
+    parser.add_argument("--repeat", type=int, default=3, help="Measurements per case; the fastest is kept")
+    parser.add_argument("--scale", type=int, default=100_000, help="Elements for formatting/parsing cases")
+    parser.add_argument("--chart-scale", type=int, default=100_000, help="Assets for the chart data case")
+    parser.add_argument("--quick", action="store_true", help="Skip the 1M-asset calculate case")
+    parser.add_argument("--filter", default="",
+                        help="Only run the case with this name, or the cases whose name starts with it "
+                             "followed by '[', ']', '/' or '.' (e.g. 'calculate', 'calculate[cents]', "
+                             "'parse_brl_many/100000')")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """
+    Runs the benchmark suite, optionally saving and comparing results.
+
+    Raises:
+        SystemExit: With code 1 if any case regressed beyond the threshold.
+
+    Example:
+        Run via command line:
+        `$ python scripts/benchmark.py --output bench.json`
+        `$ python scripts/benchmark.py --baseline bench.json --threshold 0.2`
+    """
+    args = parse_args()
+    sizes = tuple(size for size in CALCULATE_SIZES if not (args.quick and size >= 1_000_000))
+    cases = build_cases(sizes, args.scale, args.chart_scale, args.filter)
+    if not cases:
+        raise SystemExit(f"No benchmark case matches --filter {args.filter!r}.")
+
+    results = {}
+    for name, (func, n) in cases.items():
+        seconds = time_case(func, args.repeat)
+        results[name] = {"seconds": seconds, "n": n, "per_second": n / seconds if seconds else None}
+        print(f"{name:<45} {seconds * 1000:10.3f} ms  {n / seconds:>14,.0f} /s")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions beyond threshold:", file=sys.stderr)
+            for message in regressions:
+                print(f"  {message}", file=sys.stderr)
+            raise SystemExit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%} vs. {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
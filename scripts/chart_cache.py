@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import shutil
+from functools import lru_cache
+from pathlib import Path
+
+# Bump when the cache entries themselves change (layout changes are caught
+# by the `source_version` of the renderer, which is part of every key).
+LAYOUT_VERSION = 2
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+def renderer_version(*packages: str) -> str:
+    """
+    Describes the installed renderer packages without importing them.
+
+    Args:
+        *packages (str): Distribution names, e.g. ``"plotly", "kaleido"``.
+
+    Returns:
+        str: ``"name=version"`` pairs joined by commas; missing packages are
+             reported as ``"name=missing"``.
+    """
+    from importlib import metadata
+
+    versions = []
+    for package in packages:
+        try:
+            versions.append(f"{package}={metadata.version(package)}")
+        except metadata.PackageNotFoundError:
+            versions.append(f"{package}=missing")
+    return ",".join(versions)
+
+
+@lru_cache(maxsize=None)
+def source_version(*paths) -> str:
+    """
+    Hashes the source files that produce a chart.
+
+    Any edit to the renderer code changes the hash, so renders made by older
+    code are never served from the cache. The files are read once per process.
+
+    Args:
+        *paths: Source files, e.g. ``generate_chart.py`` and the modules it uses.
+
+    Returns:
+        str: Hex SHA-256 digest of the files, in the given order.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+def cache_key(data: dict, backend: str, code: str, **params) -> str:
+    """
+    Computes a content hash for a chart render.
+
+    Args:
+        data (dict): Input data, as loaded from the JSON file.
+        backend (str): Name of the renderer that draws the chart.
+        code (str): Version of the renderer code, see `source_version`.
+        **params: Everything else that changes the output, such as width,
+                  height, renderer package versions and options.
+
+    Returns:
+        str: Hex SHA-256 digest of the canonical JSON of the inputs.
+    """
+    payload = {"layout": LAYOUT_VERSION, "backend": backend, "code": code, "data": data, "params": params}
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """
+    On-disk cache of rendered charts, keyed by `cache_key`.
+
+    Entries are plain files named after their key. Reading an entry refreshes
+    its modification time, and when the directory grows past ``max_bytes`` the
+    least recently used entries are removed first.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES, suffix: str = ".svg"):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def fetch(self, key: str, output_path: Path) -> bool:
+        """
+        Copies a cached render to ``output_path`` if there is one.
+
+        Args:
+            key (str): Cache key of the render.
+            output_path (Path): Where the chart should be written.
+
+        Returns:
+            bool: True on a cache hit, False otherwise.
+        """
+        path = self._path(key)
+        if not path.is_file():
+            return False
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(path, output_path)
+        os.utime(path)
+        return True
+
+    def store(self, key: str, output_path: Path) -> None:
+        """
+        Adds a freshly rendered chart to the cache and evicts old entries.
+
+        Args:
+            key (str): Cache key of the render.
+            output_path (Path): The rendered chart file.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Unique per process, so workers sharing the cache never clash.
+        temporary = self.directory / f"{key}.{os.getpid()}.tmp"
+        shutil.copyfile(output_path, temporary)
+        os.replace(temporary, self._path(key))
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Removes least recently used entries until the cache fits in ``max_bytes``.
+        """
+        entries = []
+        for path in self.directory.glob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # evicted by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -0,0 +1,96 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from utils.archive import write_archive
+from utils.calcula import MODES
+from utils.streams import READERS, calculate_notes, detect_format
+
+
+def iter_source_notes(paths: list):
+    """
+    Reads notes from JSON, JSON Lines or CSV files.
+
+    A ``.json`` file holds a single note in the `data/demo_data.json` schema
+    and is identified by its file name; ``.jsonl`` and ``.csv`` files are
+    streamed note by note with the batch-mode readers.
+
+    Args:
+        paths (list): Input file paths.
+
+    Yields:
+        tuple: ``(note_id, record)`` for each note.
+    """
+    for path in paths:
+        if path.suffix.lower() == ".json":
+            with path.open("r", encoding="utf-8") as handle:
+                yield path.stem, json.load(handle)
+            continue
+        with path.open("r", encoding="utf-8", newline="") as handle:
+            yield from READERS[detect_format(str(path))](handle)
+
+
+def convert(paths: list, output: Path, mode: str = "float") -> tuple:
+    """
+    Calculates every note in ``paths`` and writes the results to an archive.
+
+    Notes that fail to calculate are reported on stderr and left out.
+
+    Args:
+        paths (list): Input file paths (see `iter_source_notes`).
+        output (Path): Archive file to write.
+        mode (str): Calculation mode passed to `calculate`.
+
+    Returns:
+        tuple: ``(note_count, row_count, ticker_count, error_count)``.
+    """
+    errors = 0
+
+    def results():
+        nonlocal errors
+        for note_id, result, error in calculate_notes(iter_source_notes(paths), mode=mode):
+            if error is not None:
+                errors += 1
+                print(f"nota {note_id}: {error}", file=sys.stderr)
+                continue
+            yield note_id, result
+
+    return (*write_archive(str(output), results()), errors)
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Convert notes in the demo_data.json schema into a binary columnar archive."
+    )
+    parser.add_argument("inputs", type=Path, nargs="+", help="Input files (.json, .jsonl or .csv)")
+    parser.add_argument("--output", type=Path, required=True, help="Archive file to write")
+    parser.add_argument("--mode", choices=MODES, default="float", help="Calculation mode")
+    return parser.parse_args()
+
+
+def main() -> int:
+    """
+    Main script execution function.
+
+    Example:
+        Run via command line:
+        `$ python scripts/convert_archive.py data/demo_data.json --output notas.cda`
+    """
+    args = parse_args()
+    notes, rows, tickers, errors = convert(args.inputs, args.output, args.mode)
+    print(f"{notes} notas, {rows} linhas e {tickers} tickers gravados em {args.output}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
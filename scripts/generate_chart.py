@@ -1,37 +1,36 @@
 import argparse
+import glob
+import heapq
 import json
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.util import Finalize
+from html import escape
+from operator import itemgetter
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "src"))
 
-import plotly.graph_objects as go
+from chart_cache import DEFAULT_MAX_BYTES, RenderCache, cache_key, renderer_version, source_version
+from utils import brl, calcula
+from utils.calcula import calculate_compact, calculate_components, merge_duplicates
+from utils.brl import format_brl, format_brl_no_decimals
+from utils.profiling import PROFILER
 
-from utils.calcula import calculate
-from utils.formatters import format_brl
+# Code whose changes alter a rendered chart; hashed into every cache key.
+RENDERER_SOURCES = (__file__, calcula.__file__, brl.__file__)
 
+OTHERS_LABEL = "Outros"
 
-def format_brl_no_decimals(value: float) -> str:
-    """
-    Formats a numeric value in Brazilian **R$** without decimal places.
-    
-    Converts a float number to a string in Brazilian currency format,
-    using dots as thousands separators and without displaying cents.
-    
-    Args:
-        value (float): Numeric value to be formatted.
-        
-    Returns:
-        str: Formatted string in the pattern "R$ X.XXX" (e.g., "R$ 1.250").
-        
-    Example:
-        >>> format_brl_no_decimals(1250.75)
-        'R$ 1.250'
-    """
-    formatted = f"{value:,.0f}"
-    formatted = formatted.replace(",", "_").replace("_", ".")
-    return f"R$ {formatted}"
+BACKGROUND_COLOR = "#151b24"
+BAR_COLORS = ["#2F6BFF", "#40B24D", "#F2B01E", "#D63C3C"]
+BAR_LINE_COLOR = "#0f1218"
+TEXT_COLOR = "#E6E6E6"
+MARGIN = dict(l=40, r=40, t=90, b=40)
+BACKENDS = ("plotly", "svg")
 
 
 def format_percent(value: float) -> str:
@@ -101,18 +100,27 @@ def load_demo_data(path: Path) -> dict:
         return json.load(handle)
 
 
-def build_chart_data(data: dict) -> dict:
+def build_chart_data(data: dict, top_n: int = None) -> dict:
     """
     Processes raw data and calculates information needed for the chart.
     
     Receives asset and cost data, calculates proportions, individual costs,
     and enriches each item with percentages and sorting by descending value.
-    Uses the `calculate()` function to determine the proportional cost of each asset.
+    Uses the `calculate_compact()` function to determine the proportional cost of each asset;
+    repeated tickers are merged into a single item.
+    Runs in linear time plus a single sort; with ``top_n`` the largest items
+    are picked with a heap and the remaining ones are grouped into an
+    "Outros" item, so large portfolios stay cheap and readable.
     
     Args:
         data (dict): Dictionary containing:
                     - 'items': list of dicts with 'ticker' and 'valor'
                     - 'custo_total': total cost to be distributed
+                    - 'custos' (optional): cost split by component, e.g.
+                      {'corretagem': 10, 'emolumentos': 0.35}; when present,
+                      'custo_total' defaults to its sum
+        top_n (int, optional): Keep only the ``top_n`` largest items and sum
+                    the rest into a final "Outros" item.
                     
     Returns:
         dict: Enriched dictionary containing:
@@ -123,6 +131,7 @@ def build_chart_data(data: dict) -> dict:
                   * 'value': asset value
                   * 'percent': percentage it represents of the total
                   * 'cost': calculated proportional cost
+                  * 'costs': cost of each component (only with 'custos')
                   
     Raises:
         SystemExit: If no items are found in the input data.
@@ -141,35 +150,120 @@ def build_chart_data(data: dict) -> dict:
     if not items:
         raise SystemExit("No items found in demo data.")
 
-    tickers = [item["ticker"] for item in items]
-    values = [float(item["valor"]) for item in items]
+    tickers, values = merge_duplicates(
+        [item["ticker"] for item in items], [float(item["valor"]) for item in items]
+    )
     total_value = sum(values)
-    total_grade = total_value + float(data.get("custo_total"))
-    if total_grade is None:
-        raise SystemExit("Total grade could not be calculated, because total value is None.")
-    calculated = calculate(tickers, values, total_grade)
-
-    enriched = []
-    for ticker, value in zip(tickers, values):
-        proportion = 0 if total_value == 0 else value / total_value
-        cost = calculated[ticker]["cost"]
-        enriched.append(
-            {
-                "ticker": ticker,
-                "value": value,
-                "percent": proportion * 100,
-                "cost": cost,
+    components = {name: float(amount) for name, amount in (data.get("custos") or {}).items()}
+    if components and "custo_total" not in data:
+        custo_total = sum(components.values())
+    else:
+        custo_total = float(data["custo_total"])
+    total_grade = total_value + custo_total
+    with PROFILER.stage("calculate"):
+        if components:
+            calculated = calculate_components(tickers, values, components)
+        else:
+            calculated = calculate_compact(tickers, values, total_grade)
+
+    percent_scale = 0 if total_value == 0 else 100 / total_value
+    enriched = [
+        {
+            "ticker": ticker,
+            "value": value,
+            "percent": value * percent_scale,
+            "cost": cost,
+        }
+        for ticker, value, cost in zip(tickers, values, calculated.costs)
+    ]
+    if components:
+        for item, *component_costs in zip(enriched, *calculated.components.values()):
+            item["costs"] = dict(zip(calculated.components, component_costs))
+
+    if top_n is not None and len(enriched) > top_n:
+        top = heapq.nlargest(top_n, enriched, key=itemgetter("value"))
+        kept = {id(item) for item in top}
+        others = [item for item in enriched if id(item) not in kept]
+        others_value = sum(item["value"] for item in others)
+        others_item = {
+            "ticker": OTHERS_LABEL,
+            "value": others_value,
+            "percent": others_value * percent_scale,
+            "cost": round(sum(item["cost"] for item in others), 2),
+        }
+        if components:
+            others_item["costs"] = {
+                name: round(sum(item["costs"][name] for item in others), 2) for name in components
             }
-        )
-        enriched.sort(key=lambda x: x["value"], reverse=True)
+        top.append(others_item)
+        enriched = top
+    else:
+        enriched.sort(key=itemgetter("value"), reverse=True)
 
     return {
         "total_value": total_value,
-        "custo_total": float(data["custo_total"]),
+        "custo_total": custo_total,
         "items": enriched,
     }
 
 
+def chart_x_range(max_value: float) -> tuple:
+    """
+    Computes the horizontal axis range and label positions of the chart.
+    
+    The axis extends to the left of zero to make room for the ticker labels
+    and to the right of the largest bar for the cost labels.
+    
+    Args:
+        max_value (float): Largest asset value in the chart.
+        
+    Returns:
+        tuple: ``(x_min, x_max, x_left, x_right)`` where ``x_left`` and
+               ``x_right`` are the anchors of the left and right labels.
+    """
+    left_pad = max_value * 0.55
+    right_pad = max_value * 0.65
+    x_min = -left_pad
+    x_max = max_value + right_pad
+    x_left = x_min + left_pad * 0.08
+    x_right = max_value + right_pad * 0.05
+    return x_min, x_max, x_left, x_right
+
+
+def chart_title(chart_data: dict) -> str:
+    """
+    Builds the chart title with the total value and total cost.
+    
+    Args:
+        chart_data (dict): Dictionary with 'total_value' and 'custo_total'.
+        
+    Returns:
+        str: Title text, e.g. "Total: R$ 8.000,00 -> Custo Total: R$ 250,00".
+    """
+    return (
+        f"Total: {format_brl(chart_data['total_value'])} -> "
+        f"Custo Total: {format_brl(chart_data['custo_total'])}"
+    )
+
+
+def chart_labels(item: dict) -> tuple:
+    """
+    Builds the left (ticker and value) and right (percent and cost) labels of a bar.
+    
+    Args:
+        item (dict): Chart item with 'ticker', 'value', 'percent' and 'cost'.
+        
+    Returns:
+        tuple: ``(left_label, right_label)``, e.g.
+               ``("PETR4 (R$ 1.500)", "18,75% -> Custo: R$ 46,88")``.
+    """
+    with PROFILER.stage("format_brl"):
+        return (
+            f"{item['ticker']} ({format_brl_no_decimals(item['value'])})",
+            f"{format_percent(item['percent'])} -> Custo: {format_brl(item['cost'])}",
+        )
+
+
 def render_chart(chart_data: dict, output_path: Path, width: int, height: int) -> None:
     """
     Renders a horizontal bar chart with asset data and saves as **SVG**.
@@ -202,19 +296,14 @@ def render_chart(chart_data: dict, output_path: Path, width: int, height: int) -
         >>> data = {'total_value': 1000, 'custo_total': 50, 'items': [...]}
         >>> render_chart(data, Path('output.svg'), 1400, 520)
     """
+    import plotly.graph_objects as go
+
     items = chart_data["items"]
     values = [item["value"] for item in items]
     tickers = [item["ticker"] for item in items]
 
-    max_value = max(values)
-    left_pad = max_value * 0.55
-    right_pad = max_value * 0.65
-    x_min = -left_pad
-    x_max = max_value + right_pad
-    x_left = x_min + left_pad * 0.08
-    x_right = max_value + right_pad * 0.05
-
-    colors = ["#2F6BFF", "#40B24D", "#F2B01E", "#D63C3C"]
+    x_min, x_max, x_left, x_right = chart_x_range(max(values))
+    colors = BAR_COLORS
 
     fig = go.Figure(
         data=[
@@ -224,7 +313,7 @@ def render_chart(chart_data: dict, output_path: Path, width: int, height: int) -
                 orientation="h",
                 marker=dict(
                     color=[colors[i % len(colors)] for i in range(len(items))],
-                    line=dict(color="#0f1218", width=1.5),
+                    line=dict(color=BAR_LINE_COLOR, width=1.5),
                 ),
                 hovertemplate="%{y}: R$ %{x:,.2f}<extra></extra>",
             )
@@ -234,18 +323,15 @@ def render_chart(chart_data: dict, output_path: Path, width: int, height: int) -
     fig.update_layout(
         width=width,
         height=height,
-        paper_bgcolor="#151b24",
-        plot_bgcolor="#151b24",
-        margin=dict(l=40, r=40, t=90, b=40),
+        paper_bgcolor=BACKGROUND_COLOR,
+        plot_bgcolor=BACKGROUND_COLOR,
+        margin=MARGIN,
         showlegend=False,
         xaxis=dict(visible=False, range=[x_min, x_max]),
         yaxis=dict(visible=False, autorange="reversed"),
-        font=dict(color="#E6E6E6", size=16),
+        font=dict(color=TEXT_COLOR, size=16),
         title=dict(
-            text=escape_plotly_text(
-                f"Total: {format_brl(chart_data['total_value'])} -> "
-                f"Custo Total: {format_brl(chart_data['custo_total'])}"
-            ),
+            text=escape_plotly_text(chart_title(chart_data)),
             x=0.02,
             xanchor="left",
             y=0.96,
@@ -255,12 +341,7 @@ def render_chart(chart_data: dict, output_path: Path, width: int, height: int) -
     )
 
     for item in items:
-        left_label = escape_plotly_text(
-            f"{item['ticker']} ({format_brl_no_decimals(item['value'])})"
-        )
-        right_label = escape_plotly_text(
-            f"{format_percent(item['percent'])} -> Custo: {format_brl(item['cost'])}"
-        )
+        left_label, right_label = map(escape_plotly_text, chart_labels(item))
 
         fig.add_annotation(
             x=x_left,
@@ -269,7 +350,7 @@ def render_chart(chart_data: dict, output_path: Path, width: int, height: int) -
             showarrow=False,
             xanchor="left",
             yanchor="middle",
-            font=dict(size=18, color="#E6E6E6"),
+            font=dict(size=18, color=TEXT_COLOR),
             xref="x",
             yref="y",
         )
@@ -280,7 +361,7 @@ def render_chart(chart_data: dict, output_path: Path, width: int, height: int) -
             showarrow=False,
             xanchor="left",
             yanchor="middle",
-            font=dict(size=18, color="#E6E6E6"),
+            font=dict(size=18, color=TEXT_COLOR),
             xref="x",
             yref="y",
         )
@@ -297,6 +378,72 @@ def render_chart(chart_data: dict, output_path: Path, width: int, height: int) -
     fig.write_image(str(output_path))
 
 
+def render_chart_svg(chart_data: dict, output_path: Path, width: int, height: int) -> None:
+    """
+    Renders the same chart as `render_chart` by writing **SVG** text directly.
+    
+    Reproduces the Plotly layout (dark background, bar palette, reversed
+    category axis with 80% bar width, title and left/right labels) with no
+    third-party dependency, so it runs in milliseconds instead of starting
+    a headless browser through kaleido.
+    
+    Args:
+        chart_data (dict): Dictionary with processed data, as for `render_chart`.
+        output_path (Path): Full path where the SVG file will be saved.
+        width (int): Chart width in pixels.
+        height (int): Chart height in pixels.
+        
+    Returns:
+        None: The function saves the chart to a file and does not return a value.
+        
+    Example:
+        >>> data = build_chart_data(load_demo_data(Path('data/demo_data.json')))
+        >>> render_chart_svg(data, Path('output.svg'), 1400, 520)
+    """
+    items = chart_data["items"]
+    x_min, x_max, x_left, x_right = chart_x_range(max(item["value"] for item in items))
+
+    plot_left = MARGIN["l"]
+    plot_top = MARGIN["t"]
+    plot_width = width - MARGIN["l"] - MARGIN["r"]
+    band = (height - MARGIN["t"] - MARGIN["b"]) / len(items)
+    x_scale = plot_width / (x_max - x_min)
+
+    def to_x(value: float) -> float:
+        return plot_left + (value - x_min) * x_scale
+
+    font = 'font-family="Open Sans, verdana, arial, sans-serif"'
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}">',
+        f'<rect width="{width}" height="{height}" fill="{BACKGROUND_COLOR}"/>',
+        f'<text x="{width * 0.02:.2f}" y="{height * 0.04:.2f}" {font} font-size="20" '
+        f'fill="{TEXT_COLOR}" dominant-baseline="hanging">{escape(chart_title(chart_data))}</text>',
+    ]
+    zero = to_x(0)
+    for index, item in enumerate(items):
+        center = plot_top + (index + 0.5) * band
+        end = to_x(item["value"])
+        left_label, right_label = chart_labels(item)
+        parts.append(
+            f'<rect x="{min(zero, end):.2f}" y="{center - band * 0.4:.2f}" '
+            f'width="{abs(end - zero):.2f}" height="{band * 0.8:.2f}" '
+            f'fill="{BAR_COLORS[index % len(BAR_COLORS)]}" stroke="{BAR_LINE_COLOR}" stroke-width="1.5"/>'
+        )
+        for x, label in ((x_left, left_label), (x_right, right_label)):
+            parts.append(
+                f'<text x="{to_x(x):.2f}" y="{center:.2f}" {font} font-size="18" '
+                f'fill="{TEXT_COLOR}" dominant-baseline="central">{escape(label)}</text>'
+            )
+    parts.append("</svg>")
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text("\n".join(parts) + "\n", encoding="utf-8")
+
+
+RENDERERS = {"plotly": render_chart, "svg": render_chart_svg}
+
+
 def parse_args() -> argparse.Namespace:
     """
     Parses command-line arguments for chart generation.
@@ -306,10 +453,19 @@ def parse_args() -> argparse.Namespace:
     
     Returns:
         argparse.Namespace: Object containing the parsed arguments:
-                           - data: Path to the input JSON file
+                           - data: Path to the input JSON file, directory or glob
                            - output: Path to the output SVG file
+                           - output_dir: output directory for several input files
+                           - workers: worker processes for several input files
                            - width: chart width in pixels
                            - height: chart height in pixels
+                           - top: number of assets to show (None for all)
+                           - backend: renderer, 'plotly' or 'svg'
+                           - cache_dir: directory of the render cache
+                           - cache_max_mb: size limit of the render cache
+                           - no_cache: whether to bypass the render cache
+                           - profile: whether to print per-stage timings
+                           - profile_output: cProfile dump path (None for no dump)
                            
     Default Values:
         - data: ROOT/data/demo_data.json
@@ -329,7 +485,7 @@ def parse_args() -> argparse.Namespace:
         "--data",
         type=Path,
         default=ROOT / "data" / "demo_data.json",
-        help="Path to demo_data.json",
+        help="Path to demo_data.json, or a directory or glob of JSON files to render them all",
     )
     parser.add_argument(
         "--output",
@@ -337,8 +493,60 @@ def parse_args() -> argparse.Namespace:
         default=ROOT / "assets" / "graph.svg",
         help="Output SVG path",
     )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=ROOT / "assets" / "charts",
+        help="Output directory when --data names several files (one <name>.svg per file)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes when --data names several files (default: one per CPU)",
+    )
     parser.add_argument("--width", type=int, default=1400, help="Output width in px")
     parser.add_argument("--height", type=int, default=520, help="Output height in px")
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=None,
+        help=f"Show only the N largest assets and group the rest as '{OTHERS_LABEL}'",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="plotly",
+        help="Renderer: 'plotly' (needs plotly and kaleido) or 'svg' (no dependencies)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=ROOT / ".cache" / "charts",
+        help="Directory of the render cache",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / (1024 * 1024),
+        help="Maximum size of the render cache in MB",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always render, without reading or writing the cache",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-stage timing breakdown to stderr",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=Path,
+        default=None,
+        help="Also write a cProfile dump (readable with pstats) to this file",
+    )
     return parser.parse_args()
 
 
@@ -349,8 +557,10 @@ def main() -> None:
     Executes the complete chart generation flow:
     1. Parses command-line arguments
     2. Loads demonstration data from JSON file
-    3. Processes and enriches the data with proportional calculations
-    4. Renders and saves the chart as an SVG file
+    3. Returns early if the same data and options were already rendered
+    4. Processes and enriches the data with proportional calculations
+    5. Renders and saves the chart as an SVG file (and caches it)
+    6. With --profile, prints the time spent in each stage
     
     Returns:
         None: The function executes the complete process and does not return a value.
@@ -364,9 +574,198 @@ def main() -> None:
         `$ python generate_chart.py --width 1600 --height 600`
     """
     args = parse_args()
-    demo_data = load_demo_data(args.data)
-    chart_data = build_chart_data(demo_data)
-    render_chart(chart_data, args.output, args.width, args.height)
+    if args.profile or args.profile_output:
+        PROFILER.enable(args.profile_output)
+    try:
+        inputs = resolve_inputs(args.data)
+        if inputs == [args.data]:
+            generate(args)
+        else:
+            failures = generate_many(args, inputs)
+            if failures:
+                raise SystemExit(1)
+    finally:
+        if PROFILER.enabled:
+            print(PROFILER.finish(), file=sys.stderr)
+
+
+def resolve_inputs(data: Path) -> list:
+    """
+    Expands the ``--data`` argument into the input files to render.
+
+    Args:
+        data (Path): A JSON file, a directory (all its ``*.json`` files) or a
+                     glob pattern such as ``notes/*.json``.
+
+    Returns:
+        list: The input paths, sorted; ``[data]`` when it names a single file.
+
+    Raises:
+        SystemExit: If a directory or pattern matches no file.
+    """
+    if data.is_dir():
+        inputs = sorted(data.glob("*.json"))
+    elif any(char in str(data) for char in "*?["):
+        inputs = sorted(Path(name) for name in glob.glob(str(data)) if os.path.isfile(name))
+    else:
+        return [data]
+    if not inputs:
+        raise SystemExit(f"No JSON files found in {data}")
+    return inputs
+
+
+def _start_renderer(backend: str):
+    """
+    Imports the renderer and starts its browser once, for many charts.
+
+    With kaleido 1.x every ``write_image`` launches its own Chromium unless
+    kaleido's sync server is running, so it is started here and reused by
+    all the exports that follow. Older kaleido keeps one browser per process
+    by itself.
+
+    Args:
+        backend (str): Renderer name, one of `BACKENDS`.
+
+    Returns:
+        callable: Stops what was started; does nothing when nothing was.
+    """
+    if backend != "plotly":
+        return lambda: None
+    import plotly.graph_objects  # noqa: F401
+    import plotly.io  # noqa: F401
+
+    try:
+        import kaleido
+    except ImportError:
+        return lambda: None  # render_chart reports the missing package
+    if not hasattr(kaleido, "start_sync_server"):
+        return lambda: None
+    kaleido.start_sync_server(silence_warnings=True)
+    return lambda: kaleido.stop_sync_server(silence_warnings=True)
+
+
+def _init_worker(backend: str) -> None:
+    """
+    Starts the renderer once per worker process, for all of its charts.
+
+    Pool workers exit through multiprocessing's exit handlers rather than
+    ``atexit``, so the renderer is stopped by a `Finalize` hook.
+    """
+    Finalize(None, _start_renderer(backend), exitpriority=10)
+
+
+def _generate_one(args: argparse.Namespace, data_path: Path, output_path: Path) -> tuple:
+    """Renders one chart in a worker; returns ``(seconds, cache_hit, error)``."""
+    start = time.perf_counter()
+    try:
+        hit = generate(args, data_path, output_path)
+    except SystemExit as exc:
+        return time.perf_counter() - start, False, str(exc)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        return time.perf_counter() - start, False, f"{type(exc).__name__}: {exc}"
+    return time.perf_counter() - start, hit, None
+
+
+def generate_many(args: argparse.Namespace, inputs: list) -> int:
+    """
+    Renders several input files in one invocation over a worker pool.
+
+    Each worker imports the renderer and starts its browser once (see
+    `_start_renderer`) and keeps them for all the charts it is given, so the
+    start-up cost is paid per worker rather than per chart. Charts are
+    written to ``args.output_dir`` as ``<input name>.svg``. The time of each
+    chart and the total wall-clock time are printed to stderr, in input order.
+
+    Args:
+        args (argparse.Namespace): Arguments returned by `parse_args`.
+        inputs (list): Input JSON paths, as returned by `resolve_inputs`.
+
+    Returns:
+        int: Number of charts that failed.
+
+    Raises:
+        SystemExit: If two inputs have the same name, so their charts would
+                    overwrite each other.
+    """
+    outputs = [args.output_dir / f"{path.stem}.svg" for path in inputs]
+    claimed = {}
+    for data, output in zip(inputs, outputs):
+        if output in claimed:
+            raise SystemExit(f"{claimed[output]} and {data} would both be written to {output}; rename one of them.")
+        claimed[output] = data
+
+    workers = args.workers or min(os.cpu_count() or 1, len(inputs))
+    start = time.perf_counter()
+    if workers <= 1:
+        stop_renderer = _start_renderer(args.backend)
+        try:
+            results = [_generate_one(args, data, output) for data, output in zip(inputs, outputs)]
+        finally:
+            stop_renderer()
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(args.backend,)) as executor:
+            results = list(executor.map(_generate_one, [args] * len(inputs), inputs, outputs))
+    elapsed = time.perf_counter() - start
+
+    failures = 0
+    for data, output, (seconds, hit, error) in zip(inputs, outputs, results):
+        if error is None:
+            status = f"{output} (cache)" if hit else str(output)
+        else:
+            failures += 1
+            status = f"erro: {error}"
+        print(f"{data.name}: {seconds * 1000:.1f} ms -> {status}", file=sys.stderr)
+    print(
+        f"{len(inputs) - failures}/{len(inputs)} gráficos em {elapsed:.2f} s (workers: {workers})",
+        file=sys.stderr,
+    )
+    return failures
+
+
+def generate(args: argparse.Namespace, data_path: Path = None, output_path: Path = None) -> bool:
+    """
+    Loads the data and writes the chart, reusing a cached render when possible.
+
+    Args:
+        args (argparse.Namespace): Arguments returned by `parse_args`.
+        data_path (Path, optional): Input file; defaults to ``args.data``.
+        output_path (Path, optional): Output file; defaults to ``args.output``.
+
+    Returns:
+        bool: True if the chart was copied from the cache.
+    """
+    data_path = data_path or args.data
+    output_path = output_path or args.output
+    with PROFILER.stage("load"):
+        demo_data = load_demo_data(data_path)
+
+    cache = None
+    if not args.no_cache:
+        with PROFILER.stage("cache"):
+            cache = RenderCache(args.cache_dir, int(args.cache_max_mb * 1024 * 1024))
+            key = cache_key(
+                demo_data,
+                args.backend,
+                source_version(*RENDERER_SOURCES),
+                width=args.width,
+                height=args.height,
+                top=args.top,
+                renderer=renderer_version("plotly", "kaleido") if args.backend == "plotly" else None,
+            )
+            hit = cache.fetch(key, output_path)
+        if hit:
+            PROFILER.count("cache hits")
+            return True
+
+    with PROFILER.stage("build_chart_data"):
+        chart_data = build_chart_data(demo_data, args.top)
+    PROFILER.count("items", len(chart_data["items"]))
+    with PROFILER.stage("render_chart"):
+        RENDERERS[args.backend](chart_data, output_path, args.width, args.height)
+    if cache is not None:
+        with PROFILER.stage("cache"):
+            cache.store(key, output_path)
+    return False
 
 
 if __name__ == "__main__":
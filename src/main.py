@@ -1,16 +1,18 @@
-from utils.calcula import calculate
-from utils.formatters import format_brl
-from utils.prompts import FloatPromptBR
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.prompt import Prompt, IntPrompt, Confirm
-from rich import box
+# Keep module-level imports light: batch mode runs on these alone, while rich,
+# the prompts and the process pool are imported only when they are used.
+from utils.calcula import MODES
+from utils.streams import NOTE_ERRORS, READERS, WRITERS, calculate_notes, detect_format, iter_result_rows, note_quantities
+from utils.profiling import PROFILER
+from collections import deque
+import argparse
+import os
+import sys
 import time
 
-console = Console(emoji=True, safe_box=True)
+def print_header(console):
+    from rich.panel import Panel
+    from rich import box
 
-def print_header():
     console.clear()
     console.print(Panel.fit(
         "[bold orchid1]:gem: CALCULADORA DE ATIVOS[/bold orchid1] [bold cyan]PRO[/bold cyan]\n" \
@@ -20,8 +22,21 @@ def print_header():
         padding=(1, 4)
     ))
 
-def main():
-    print_header()
+def main(delay: float = 0.0, ledger_path: str = None, page_size: int = 50):
+    from rich.console import Console
+    from rich.prompt import Prompt, IntPrompt, Confirm
+    from utils.note import Note
+    from utils.prompts import FloatPromptBR
+    from utils.calcula import COST_COMPONENTS
+    from utils.report import COMPONENT_LABELS, print_report
+
+    console = Console(emoji=True, safe_box=True)
+    ledger = None
+    if ledger_path:
+        from utils.ledger import Ledger
+
+        ledger = Ledger(ledger_path)
+    print_header(console)
     while True:
         try:
             console.print("\n[bold slate_blue1]:sparkles: :small_blue_diamond: Nova Simulação :small_blue_diamond: :sparkles:[/bold slate_blue1]")
@@ -29,47 +44,49 @@ def main():
             # Input gathering
             n = IntPrompt.ask("[bold deep_sky_blue1]:1234: Quantos ativos compõem a nota?[/bold deep_sky_blue1]")
             
-            ticket_names = []
-            list_of_values = []
+            note = Note()
+            quantities = {}
             
             for i in range(n):
                 console.print(f"\n[bold gold1]   :arrow_forward: Ativo #{i + 1}[/bold gold1]")
                 name = Prompt.ask("[bold medium_purple1]  :label:  Nome/Ticker[/bold medium_purple1]").strip().upper()
                 val = FloatPromptBR.ask(f"[bold medium_purple1]  :heavy_dollar_sign: Valor sem o custo de aquisição ([/bold medium_purple1][bold cyan]{name}[/bold cyan][bold medium_purple1])[/bold medium_purple1]")
-                ticket_names.append(name)
-                list_of_values.append(val)
+                if name in note:
+                    console.print(f"[yellow]  :heavy_plus_sign: {name} já foi informado; o valor foi somado ao anterior.[/yellow]")
+                    note.update_value(name, note.value(name) + val)
+                else:
+                    note.add_asset(name, val)
+                if ledger is not None:
+                    # Only the ledger uses quantities (average price); 0 leaves it out.
+                    quantity = FloatPromptBR.ask(f"[bold medium_purple1]  :input_numbers: Quantidade ([/bold medium_purple1][bold cyan]{name}[/bold cyan][bold medium_purple1], 0 se não souber)[/bold medium_purple1]", default=0.0, show_default=False)
+                    if quantity:
+                        quantities[name] = quantities.get(name, 0.0) + quantity
 
             console.print()
-            total_grade = FloatPromptBR.ask("[bold hot_pink]:receipt: Valor Total da Nota (Liquidação)[/bold hot_pink]")
+            if Confirm.ask("[bold hot_pink]:receipt: Detalhar os custos por componente (corretagem, emolumentos...)?[/bold hot_pink]", default=False):
+                note.set_components({
+                    name: FloatPromptBR.ask(f"[bold medium_purple1]  :heavy_minus_sign: {COMPONENT_LABELS[name]}[/bold medium_purple1]")
+                    for name in COST_COMPONENTS
+                })
+            else:
+                note.set_total(FloatPromptBR.ask("[bold hot_pink]:receipt: Valor Total da Nota (Liquidação)[/bold hot_pink]"))
 
             # Calculation
             with console.status("[bold violet]:gear: Processando distribuição proporcional...[/bold violet]", spinner="bouncingBar"):
-                # Simulate a tiny delay for UX
-                time.sleep(0.8) 
-                result = calculate(ticket_names, list_of_values, total_grade)
-
-            # Display Results Table
-            table = Table(title="[bold yellow]:bar_chart: Relatório de Custos[/bold yellow]",
-                          box=box.ROUNDED,
-                          show_lines=True,
-                          title_style="not italic",
-                          header_style="bold gold1",
-                          border_style="violet"
-                        )
-            table.add_column(":label:  Nome/Ticker", style="bold cyan", no_wrap=True, justify="center")
-            table.add_column(":dollar: Valor Inicial", style="dodger_blue1", no_wrap=True, justify="center",)
-            table.add_column(":chart_with_downwards_trend: Custo (+)", style="red", no_wrap=True, justify="center")
-            table.add_column(":moneybag: Valor Final (=)", style="bold spring_green1", no_wrap=True, justify="center")
-
-            for ticket, data in result.items():
-                table.add_row(
-                    ticket,
-                    format_brl(data['value']),
-                    format_brl(data['cost']),
-                    format_brl(data['value_cost']),
-                )
-
-            console.print("\n", table)
+                # Optional artificial delay for UX (--delay)
+                if delay:
+                    time.sleep(delay)
+                with PROFILER.stage("calculate"):
+                    result = note.result()
+
+            # Display Results Table, one page at a time
+            totals = print_report(
+                console, result.breakdown_rows(), note.total_grade, page_size, tuple(result.components)
+            )
+            PROFILER.count("notes")
+            PROFILER.count("rows", totals.rows)
+            if ledger is not None:
+                ledger.record(result, quantities=quantities or None)
             
             # Continue?
             console.print()
@@ -78,7 +95,7 @@ def main():
                 break
             
             console.clear()
-            print_header()
+            print_header(console)
 
         except KeyboardInterrupt:
             console.print("\n[bold red1]:stop_sign: Operação interrompida pelo usuário.[/bold red1]")
@@ -89,6 +106,293 @@ def main():
         except Exception as e:
             console.print(f"\n[bold red1]:x: Um erro inesperado ocorreu: {e}[/bold red1]")
             console.print("[dim]Reiniciando o ciclo...[/dim]")
+    if ledger is not None:
+        ledger.close()
+
+def _read_quantities(notes, quantities: deque):
+    """
+    Pass ``(note_id, record)`` pairs through, queueing each note's quantities.
+
+    Results come back in input order (also from the process pool), so the
+    caller pops one entry per result: the `note_quantities` dict, None, or
+    the exception raised for an invalid quantity.
+    """
+    for note_id, record in notes:
+        try:
+            quantities.append(note_quantities(record) if isinstance(record, dict) else None)
+        except NOTE_ERRORS as exc:
+            quantities.append(exc)
+        yield note_id, record
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    """
+    Process notes from a file or stdin without any interactive UI.
+
+    Notes are read, calculated and written one at a time, so memory usage does
+    not grow with the size of the input. With more than one worker, chunks of
+    notes are calculated in a process pool and written back in input order.
+    Invalid notes are reported on stderr and skipped. With ``consolidate``,
+    one row per ticker with the totals over all notes is written instead.
+
+    With ``checkpoint``, notes whose fingerprint is already in the checkpoint
+    file are skipped, and the output file is appended to instead of
+    overwritten, so a failed run can be resumed and a rerun only emits new or
+    changed notes.
+
+    With ``dedup``, notes with the same content as one already seen (in this
+    run or, when it names an index file, in earlier runs) are dropped before
+    they are calculated, and the number dropped is reported on stderr.
+
+    With ``ledger``, each note is recorded with the ``quantidade`` of its
+    items (see `note_quantities`), so the ledger can give average prices; a
+    note with an invalid quantity is reported like any other invalid note.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments with ``input``, ``output``,
+            ``input_format``, ``output_format``, ``mode``, ``workers``,
+            ``chunk_size``, ``stats``, ``ledger``, ``consolidate``,
+            ``checkpoint`` and ``dedup``.
+
+    Returns:
+        int: Process exit code, ``1`` if any note failed and ``0`` otherwise.
+
+    Raises:
+        ValueError: If both ``checkpoint`` and ``consolidate`` are set.
+    """
+    input_format = args.input_format or detect_format(args.input)
+    output_format = args.output_format or detect_format(args.output)
+    if args.checkpoint and args.consolidate:
+        raise ValueError("checkpoint cannot be combined with consolidate: a rerun would total only the new notes.")
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8", newline="")
+    output_mode = "a" if args.checkpoint else "w"
+    target = sys.stdout if args.output == "-" else open(args.output, output_mode, encoding="utf-8", newline="")
+    errors = 0
+    processed = 0
+    stats = None
+    ledger = None
+    if args.ledger:
+        from utils.ledger import Ledger
+
+        ledger = Ledger(args.ledger)
+    consolidation = None
+    checkpoint = None
+    if args.checkpoint:
+        from utils.checkpoint import Checkpoint
+
+        checkpoint = Checkpoint(args.checkpoint, args.mode)
+    dedup = None
+    if args.dedup is not None:
+        from utils.dedup import NoteIndex
+
+        dedup = NoteIndex(args.dedup or None)
+    start = time.perf_counter()
+    try:
+        if args.consolidate:
+            from utils.consolidate import CONSOLIDATED_FIELDS, Consolidation, iter_consolidated_rows
+
+            consolidation = Consolidation()
+            writer = WRITERS[output_format](target, CONSOLIDATED_FIELDS)
+        else:
+            writer = WRITERS[output_format](target)
+        notes = READERS[input_format](source)
+        if dedup is not None:
+            notes = dedup.unique(notes)
+        if checkpoint is not None:
+            notes = checkpoint.pending(notes)
+        quantities = None
+        if ledger is not None:
+            quantities = deque()
+            notes = _read_quantities(notes, quantities)
+        if args.workers > 1:
+            from utils.parallel import ParallelStats, run_parallel
+
+            stats = ParallelStats()
+            results = run_parallel(notes, args.workers, args.chunk_size, args.mode, stats)
+        else:
+            results = calculate_notes(notes, args.mode)
+        # Notes are read lazily, so this stage covers reading and calculating.
+        for note_id, result, error in PROFILER.iterate("read+calculate", results):
+            processed += 1
+            note_quantity = quantities.popleft() if quantities is not None else None
+            if error is None and isinstance(note_quantity, Exception):
+                result, error = None, str(note_quantity)
+            if error is not None:
+                errors += 1
+                print(f"nota {note_id}: {error}", file=sys.stderr)
+                if checkpoint is not None:
+                    checkpoint.completed(False)
+                continue
+            if consolidation is not None:
+                with PROFILER.stage("consolidate"):
+                    consolidation.add(result)
+            else:
+                with PROFILER.stage("write"):
+                    for row in iter_result_rows(note_id, result):
+                        writer.write(row)
+            if ledger is not None:
+                with PROFILER.stage("ledger"):
+                    ledger.add(result, note_id=note_id, quantities=note_quantity)
+            if checkpoint is not None and checkpoint.completed(True):
+                # Results must be on disk before their notes count as done.
+                target.flush()
+                if ledger is not None:
+                    ledger.flush()
+                checkpoint.commit()
+        if consolidation is not None:
+            with PROFILER.stage("write"):
+                for row in iter_consolidated_rows(consolidation.result()):
+                    writer.write(row)
+        if checkpoint is not None:
+            target.flush()
+            checkpoint.commit()
+            if checkpoint.skipped:
+                print(f"{checkpoint.skipped} notas já processadas foram ignoradas (checkpoint)", file=sys.stderr)
+        if dedup is not None:
+            # Only a completed run records its notes as seen.
+            dedup.close()
+            print(f"{dedup.dropped} notas duplicadas foram ignoradas (dedup)", file=sys.stderr)
+    finally:
+        if ledger is not None:
+            ledger.close()
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    PROFILER.count("notes", processed)
+    PROFILER.count("errors", errors)
+    if args.stats:
+        if stats is None:
+            from utils.parallel import ParallelStats
+
+            stats = ParallelStats()
+            stats.record(os.getpid(), processed, time.perf_counter() - start)
+            stats.wall_time = time.perf_counter() - start
+        print(stats.summary(), file=sys.stderr)
+    return 1 if errors else 0
+
+
+def serve(args: argparse.Namespace) -> int:
+    """
+    Run the local HTTP calculation service until interrupted.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments with ``host``, ``port``,
+            ``mode`` and ``batch_window`` (milliseconds).
+
+    Returns:
+        int: Process exit code.
+    """
+    import asyncio
+    from utils.service import CalculationService
+
+    service = CalculationService(args.host, args.port, args.mode, args.batch_window / 1000)
+    print(f"Servindo em http://{args.host}:{args.port} (POST /calculate, GET /metrics)", file=sys.stderr)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def startup_profile(top: int = 15) -> int:
+    """
+    Measure the cold-start import cost of this module with ``-X importtime``.
+
+    A fresh interpreter imports `main` the way a batch invocation does, and the
+    slowest imports (by cumulative time) are printed with the total.
+
+    Args:
+        top (int): Number of imports to list.
+
+    Returns:
+        int: Process exit code of the measured interpreter.
+    """
+    import subprocess
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=here, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - start
+
+    timings = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings.append((int(cumulative_us), int(self_us), name.strip()))
+
+    timings.sort(reverse=True)
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for cumulative_us, self_us, name in timings[:top]:
+        print(f"{cumulative_us / 1000:>10.1f}ms {self_us / 1000:>8.1f}ms  {name}")
+    total = sum(self_us for _, self_us, _ in timings) / 1000
+    print(f"\nimports: {total:.1f} ms   interpreter wall clock: {wall * 1000:.1f} ms")
+    return proc.returncode
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command-line arguments.
+
+    Without ``--input`` the interactive calculator is started.
+
+    Args:
+        argv (list, optional): Arguments to parse instead of ``sys.argv``.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Calculadora de Ativos: proportional cost distribution."
+    )
+    parser.add_argument("--input", help="Notes file (JSONL or CSV), or '-' for stdin. Enables batch mode.")
+    parser.add_argument("--output", default="-", help="Results file (JSONL or CSV), or '-' for stdout")
+    parser.add_argument("--input-format", choices=sorted(READERS), help="Input format (default: from file suffix, else jsonl)")
+    parser.add_argument("--output-format", choices=sorted(WRITERS), help="Output format (default: from file suffix, else jsonl)")
+    parser.add_argument("--mode", choices=MODES, default="float", help="Calculation mode (see utils.calcula.calculate)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for batch mode (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Notes per worker task (default: 1000)")
+    parser.add_argument("--stats", action="store_true", help="Print per-worker throughput to stderr")
+    parser.add_argument("--consolidate", action="store_true", help="Write one row per ticker with totals over all notes instead of per-note rows")
+    parser.add_argument("--checkpoint", help="Checkpoint file: skip notes already computed in earlier runs and append to --output")
+    parser.add_argument("--dedup", nargs="?", const="", metavar="INDEX",
+                        help="Drop notes with the same content as one already seen; with INDEX, also across runs")
+    parser.add_argument("--ledger", help="SQLite ledger file where every calculated note is recorded")
+    parser.add_argument("--page-size", type=int, default=50, help="Rows per page of the interactive report; 0 prints a single table (default: 50)")
+    parser.add_argument("--delay", type=float, default=0.0, help="Artificial delay in seconds before each interactive result (default: 0)")
+    parser.add_argument("--serve", action="store_true", help="Run the HTTP service (POST /calculate, GET /metrics)")
+    parser.add_argument("--host", default="127.0.0.1", help="Address the service listens on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Port the service listens on (default: 8080)")
+    parser.add_argument("--batch-window", type=float, default=2.0, help="Milliseconds the service waits to group requests (default: 2)")
+    parser.add_argument("--profile", action="store_true", help="Print a per-stage timing breakdown to stderr on exit")
+    parser.add_argument("--profile-output", help="Also write a cProfile dump (readable with pstats) to this file")
+    parser.add_argument("--startup-profile", action="store_true", help="Print the import-time breakdown of a cold start and exit")
+    args = parser.parse_args(argv)
+    if args.checkpoint and args.consolidate:
+        # A resumed run would total only the notes it did not skip.
+        parser.error("--checkpoint cannot be combined with --consolidate")
+    return args
+
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.startup_profile:
+        sys.exit(startup_profile())
+    if args.profile or args.profile_output:
+        PROFILER.enable(args.profile_output)
+    try:
+        if args.serve:
+            exit_code = serve(args)
+        elif args.input is not None:
+            exit_code = run_batch(args)
+        else:
+            exit_code = main(args.delay, args.ledger, args.page_size)
+    finally:
+        if PROFILER.enabled:
+            print(PROFILER.finish(), file=sys.stderr)
+    sys.exit(exit_code)
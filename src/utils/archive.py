@@ -0,0 +1,250 @@
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+MAGIC = b"CDANOTE1"
+VERSION = 1
+# Sections in file order; the header stores the byte offset of each one.
+SECTIONS = (
+    "values", "costs", "value_costs", "ticker_ids",
+    "note_offsets", "note_id_offsets", "note_id_blob",
+    "ticker_name_offsets", "ticker_name_blob",
+    "ticker_row_offsets", "ticker_rows",
+)
+_HEADER = struct.Struct("<8sIIQQQ" + "Q" * len(SECTIONS))
+_ALIGNMENT = 8
+
+
+def _as_little_endian(column: array) -> bytes:
+    if sys.byteorder != "little":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def write_archive(path: str, notes) -> tuple:
+    """
+    Write calculated notes to a binary columnar archive.
+
+    The file holds fixed-width little-endian columns (``value``, ``cost`` and
+    ``value_cost`` as float64, a uint32 ticker id per row), the row offsets of
+    each note, a sorted ticker dictionary and, per ticker, the positions of its
+    rows. Every section is 8-byte aligned so `ArchiveReader` can map it
+    directly from disk.
+
+    Args:
+        path (str): Output file path.
+        notes: Iterable of ``(note_id, result)`` pairs, where ``result`` is a
+            mapping of ticker to ``value``, ``cost`` and ``value_cost`` (as
+            returned by `calculate` or `calculate_compact`).
+
+    Returns:
+        tuple: ``(note_count, row_count, ticker_count)`` written.
+    """
+    values, costs, value_costs = array('d'), array('d'), array('d')
+    row_tickers = []
+    note_offsets = array('Q', [0])
+    note_ids = []
+    for note_id, result in notes:
+        for ticker, data in result.items():
+            row_tickers.append(ticker)
+            values.append(data['value'])
+            costs.append(data['cost'])
+            value_costs.append(data['value_cost'])
+        note_offsets.append(len(row_tickers))
+        note_ids.append(str(note_id).encode("utf-8"))
+
+    tickers = sorted(set(row_tickers))
+    ticker_index = {ticker: position for position, ticker in enumerate(tickers)}
+    ticker_ids = array('I', [ticker_index[ticker] for ticker in row_tickers])
+    del row_tickers
+
+    # Group row positions by ticker with a counting sort (stable, so each
+    # ticker's rows stay in note order).
+    counts = array('Q', bytes(8 * len(tickers)))
+    for ticker_id in ticker_ids:
+        counts[ticker_id] += 1
+    ticker_row_offsets = array('Q', [0])
+    for count in counts:
+        ticker_row_offsets.append(ticker_row_offsets[-1] + count)
+    cursor = array('Q', ticker_row_offsets[:-1])
+    ticker_rows = array('Q', bytes(8 * len(ticker_ids)))
+    for row, ticker_id in enumerate(ticker_ids):
+        ticker_rows[cursor[ticker_id]] = row
+        cursor[ticker_id] += 1
+
+    def blob(items: list) -> tuple:
+        offsets = array('Q', [0])
+        for item in items:
+            offsets.append(offsets[-1] + len(item))
+        return offsets, b"".join(items)
+
+    note_id_offsets, note_id_blob = blob(note_ids)
+    ticker_name_offsets, ticker_name_blob = blob([ticker.encode("utf-8") for ticker in tickers])
+
+    sections = {
+        "values": _as_little_endian(values),
+        "costs": _as_little_endian(costs),
+        "value_costs": _as_little_endian(value_costs),
+        "ticker_ids": _as_little_endian(ticker_ids),
+        "note_offsets": _as_little_endian(note_offsets),
+        "note_id_offsets": _as_little_endian(note_id_offsets),
+        "note_id_blob": note_id_blob,
+        "ticker_name_offsets": _as_little_endian(ticker_name_offsets),
+        "ticker_name_blob": ticker_name_blob,
+        "ticker_row_offsets": _as_little_endian(ticker_row_offsets),
+        "ticker_rows": _as_little_endian(ticker_rows),
+    }
+
+    offsets = []
+    position = _HEADER.size
+    for name in SECTIONS:
+        position += -position % _ALIGNMENT
+        offsets.append(position)
+        position += len(sections[name])
+
+    with open(path, "wb") as handle:
+        handle.write(_HEADER.pack(MAGIC, VERSION, 0, len(values), len(note_ids), len(tickers), *offsets))
+        for name, offset in zip(SECTIONS, offsets):
+            handle.write(b"\0" * (offset - handle.tell()))
+            handle.write(sections[name])
+    return len(note_ids), len(values), len(tickers)
+
+
+class ArchiveReader:
+    """
+    Memory-mapped reader for archives written by `write_archive`.
+
+    Opening an archive only parses the fixed-size header; columns are views
+    over the mapped file, so reading one note or one ticker touches just the
+    pages that hold its rows.
+
+    Example:
+        >>> with ArchiveReader("notes.cda") as archive:
+        ...     archive.note(0)
+        ...     archive.ticker("PETR4")
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        header = _HEADER.unpack_from(self._map, 0)
+        magic, version, _, self.row_count, self.note_count, self.ticker_count = header[:6]
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a notes archive (version {VERSION}).")
+        self._offsets = dict(zip(SECTIONS, header[6:]))
+
+        self.values = self._column("values", 'd', self.row_count)
+        self.costs = self._column("costs", 'd', self.row_count)
+        self.value_costs = self._column("value_costs", 'd', self.row_count)
+        self.ticker_ids = self._column("ticker_ids", 'I', self.row_count)
+        self._note_offsets = self._column("note_offsets", 'Q', self.note_count + 1)
+        self._note_id_offsets = self._column("note_id_offsets", 'Q', self.note_count + 1)
+        self._ticker_name_offsets = self._column("ticker_name_offsets", 'Q', self.ticker_count + 1)
+        self._ticker_row_offsets = self._column("ticker_row_offsets", 'Q', self.ticker_count + 1)
+        self._ticker_rows = self._column("ticker_rows", 'Q', self.row_count)
+        self._tickers = [None] * self.ticker_count
+
+    def _column(self, name: str, typecode: str, count: int):
+        start = self._offsets[name]
+        raw = self._view[start:start + count * array(typecode).itemsize]
+        if sys.byteorder == "little":
+            return raw.cast(typecode)
+        column = array(typecode, raw.tobytes())
+        column.byteswap()
+        return column
+
+    def _blob(self, name: str, offsets, index: int) -> str:
+        start = self._offsets[name]
+        return bytes(self._view[start + offsets[index]:start + offsets[index + 1]]).decode("utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.note_count
+
+    def ticker_name(self, ticker_id: int) -> str:
+        """Return the ticker with the given dictionary id (decoded once, then cached)."""
+        name = self._tickers[ticker_id]
+        if name is None:
+            name = self._tickers[ticker_id] = self._blob("ticker_name_blob", self._ticker_name_offsets, ticker_id)
+        return name
+
+    def note_id(self, index: int) -> str:
+        """Return the identifier of the note at ``index``."""
+        return self._blob("note_id_blob", self._note_id_offsets, index)
+
+    def note(self, index: int) -> list:
+        """
+        Return the rows of one note.
+
+        Args:
+            index (int): Position of the note in the archive.
+
+        Returns:
+            list: ``(ticker, value, cost, value_cost)`` tuples.
+        """
+        if not 0 <= index < self.note_count:
+            raise IndexError("note index out of range")
+        rows = range(self._note_offsets[index], self._note_offsets[index + 1])
+        return [
+            (self.ticker_name(self.ticker_ids[row]), self.values[row], self.costs[row], self.value_costs[row])
+            for row in rows
+        ]
+
+    def _find_ticker(self, ticker: str) -> int:
+        # The dictionary is sorted, so a binary search only decodes a few names.
+        low, high = 0, self.ticker_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.ticker_name(middle) < ticker:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.ticker_count and self.ticker_name(low) == ticker:
+            return low
+        raise KeyError(ticker)
+
+    def ticker(self, ticker: str) -> list:
+        """
+        Return every row of one ticker, in note order.
+
+        Args:
+            ticker (str): Ticker to look up.
+
+        Returns:
+            list: ``(note_index, value, cost, value_cost)`` tuples.
+
+        Raises:
+            KeyError: If the ticker is not in the archive.
+        """
+        ticker_id = self._find_ticker(ticker)
+        rows = self._ticker_rows[self._ticker_row_offsets[ticker_id]:self._ticker_row_offsets[ticker_id + 1]]
+        note_offsets = self._note_offsets
+        return [
+            (bisect_left(note_offsets, row + 1) - 1, self.values[row], self.costs[row], self.value_costs[row])
+            for row in rows
+        ]
+
+    def tickers(self) -> list:
+        """Return all tickers in the archive, sorted."""
+        return [self.ticker_name(position) for position in range(self.ticker_count)]
+
+    def close(self) -> None:
+        """Release the memory map and close the file."""
+        for attribute in ("values", "costs", "value_costs", "ticker_ids", "_note_offsets",
+                          "_note_id_offsets", "_ticker_name_offsets", "_ticker_row_offsets", "_ticker_rows"):
+            column = self.__dict__.pop(attribute, None)
+            if isinstance(column, memoryview):
+                column.release()
+        self._view.release()
+        self._map.close()
+        self._file.close()
@@ -0,0 +1,135 @@
+import numpy as np
+
+
+def round_cents(array):
+    """
+    Round an array to two decimals exactly like Python's ``round(x, 2)``.
+
+    ``np.round`` rounds ``x * 100``, and that product can land on the wrong
+    side of a half cent: ``33.085`` is stored slightly above the half cent,
+    so ``round`` gives ``33.09``, but ``33.085 * 100`` rounds to exactly
+    ``3308.5``, which ``np.round`` takes to the even ``33.08``. Rows whose
+    scaled value is within rounding error of a half cent are redone with
+    ``round``; every other row is already correct. In practice only sub-cent
+    inputs hit that path.
+
+    Args:
+        array (numpy.ndarray): Float array of any shape.
+
+    Returns:
+        numpy.ndarray: A new array of the rounded values.
+    """
+    scaled = array * 100
+    rounded = np.rint(scaled) / 100
+    with np.errstate(invalid="ignore"):
+        near_half = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5) <= 4 * np.spacing(np.abs(scaled))
+    for index in np.flatnonzero(near_half):
+        rounded.flat[index] = round(float(array.flat[index]), 2)
+    return rounded
+
+
+def calculate_batch(note_ids, values, total_grades) -> dict:
+    """
+    Calculate the proportional distribution for many notes in one vectorized pass.
+
+    Works on columnar inputs: every asset row carries the index of the note it
+    belongs to, and each note has a single total (liquidation value). The
+    arithmetic mirrors `calculate` step by step, adds each note's values in
+    row order like `sequential_sum` and rounds like `calculate` (see
+    `round_cents`), so results are equal to the cent.
+
+    Args:
+        note_ids (array-like): Integer note index of each asset row, in the range
+            ``0 <= note_id < len(total_grades)``. Rows do not need to be sorted.
+        values (array-like): Asset value of each row (without acquisition cost).
+        total_grades (array-like): Total value of each note, costs included.
+
+    Returns:
+        dict: A dictionary of NumPy arrays aligned with the input rows:
+              ``'value'``, ``'cost'`` and ``'value_cost'``.
+
+    Raises:
+        ValueError: If the inputs are misaligned or any note sums to zero.
+
+    Example:
+        >>> out = calculate_batch([0, 0, 1], [100.0, 200.0, 50.0], [350.0, 55.0])
+        >>> out['cost'].tolist()
+        [16.67, 33.33, 5.0]
+    """
+    note_ids = np.asarray(note_ids, dtype=np.intp)
+    values = np.asarray(values, dtype=np.float64)
+    total_grades = np.asarray(total_grades, dtype=np.float64)
+
+    if note_ids.shape != values.shape or values.ndim != 1:
+        raise ValueError("note_ids and values must be 1-D arrays of the same length.")
+    if values.size and (note_ids.min() < 0 or note_ids.max() >= total_grades.size):
+        raise ValueError("note_ids must index into total_grades.")
+
+    note_totals = np.bincount(note_ids, weights=values, minlength=total_grades.size)
+    note_sizes = np.bincount(note_ids, minlength=total_grades.size)
+    if np.any((note_sizes > 0) & (note_totals == 0)):
+        raise ValueError("Total value of inputs cannot be zero.")
+
+    row_totals = note_totals[note_ids]
+    proportion = values / row_totals
+    cost = round_cents((total_grades[note_ids] - row_totals) * proportion)
+
+    return {
+        'value': round_cents(values),
+        'value_cost': round_cents(cost + values),
+        'cost': cost,
+    }
+
+
+def calculate_batch_components(note_ids, values, components) -> dict:
+    """
+    Allocate K cost components for many notes as one N x K matrix operation.
+
+    Each row's proportion of its note is computed once and broadcast against
+    the note's component amounts, mirroring `calculate_components` in
+    ``'float'`` mode.
+
+    Args:
+        note_ids (array-like): Integer note index of each asset row.
+        values (array-like): Asset value of each row (without acquisition cost).
+        components (array-like): ``(n_notes, K)`` matrix with the amount of each
+            cost component in each note.
+
+    Returns:
+        dict: ``'value'``, ``'cost'`` and ``'value_cost'`` arrays aligned with the
+              rows, plus ``'components'``, the ``(n_rows, K)`` cost matrix.
+
+    Raises:
+        ValueError: If the inputs are misaligned or any note sums to zero.
+
+    Example:
+        >>> out = calculate_batch_components([0, 0], [100.0, 300.0], [[4.0, 0.4]])
+        >>> out['components'].tolist()
+        [[1.0, 0.1], [3.0, 0.3]]
+    """
+    note_ids = np.asarray(note_ids, dtype=np.intp)
+    values = np.asarray(values, dtype=np.float64)
+    components = np.asarray(components, dtype=np.float64)
+
+    if note_ids.shape != values.shape or values.ndim != 1:
+        raise ValueError("note_ids and values must be 1-D arrays of the same length.")
+    if components.ndim != 2:
+        raise ValueError("components must be a 2-D (notes x components) array.")
+    if values.size and (note_ids.min() < 0 or note_ids.max() >= components.shape[0]):
+        raise ValueError("note_ids must index into components.")
+
+    note_totals = np.bincount(note_ids, weights=values, minlength=components.shape[0])
+    note_sizes = np.bincount(note_ids, minlength=components.shape[0])
+    if np.any((note_sizes > 0) & (note_totals == 0)):
+        raise ValueError("Total value of inputs cannot be zero.")
+
+    proportion = values / note_totals[note_ids]
+    matrix = round_cents(components[note_ids] * proportion[:, None])
+    cost = round_cents(matrix.sum(axis=1))
+
+    return {
+        'value': round_cents(values),
+        'value_cost': round_cents(cost + values),
+        'cost': cost,
+        'components': matrix,
+    }
@@ -0,0 +1,148 @@
+import re
+from functools import lru_cache
+
+# Reason codes carried by BRLParseError, so callers can pick their own messages.
+EMPTY = "empty"
+INVALID_CHARACTERS = "invalid_characters"
+MULTIPLE_COMMAS = "multiple_commas"
+NOT_A_NUMBER = "not_a_number"
+
+# Swaps the US separators for the BRL ones; bytes.translate is the fastest
+# way to do it over a whole joined batch at once.
+_TO_BRL = bytes.maketrans(b",.", b".,")
+# Only digits, dots and minus signs, with at most one comma anywhere.
+_BRL_PATTERN = re.compile(r"[0-9.\-]*,?[0-9.\-]*")
+# The same rule for a batch of amounts joined by newlines.
+_BRL_LINES_PATTERN = re.compile(r"[0-9.\-]*,?[0-9.\-]*(?:\n[0-9.\-]*,?[0-9.\-]*)*")
+_INVALID_CHARACTER = re.compile(r"[^0-9.,\-]")
+
+
+class BRLParseError(ValueError):
+    """Raised when a string is not a valid BRL amount; ``reason`` tells why."""
+
+    def __init__(self, reason: str, value: str):
+        super().__init__(f"Invalid BRL amount ({reason}): {value!r}")
+        self.reason = reason
+        self.value = value
+
+
+def format_brl(value: float) -> str:
+    """
+    Format a number as BRL currency, e.g. ``1234.56`` -> ``'R$ 1.234,56'``.
+
+    Args:
+        value (float): Numeric value to be formatted.
+
+    Returns:
+        str: The formatted amount with two decimal places.
+    """
+    return "R$ " + f"{value:_.2f}".replace(".", ",").replace("_", ".")
+
+
+def format_brl_no_decimals(value: float) -> str:
+    """
+    Format a number as BRL currency without cents, e.g. ``1250.75`` -> ``'R$ 1.251'``.
+
+    Args:
+        value (float): Numeric value to be formatted.
+
+    Returns:
+        str: The formatted amount rounded to whole reais.
+    """
+    return "R$ " + f"{value:_.0f}".replace("_", ".")
+
+
+def parse_brl(text: str) -> float:
+    """
+    Parse a BRL amount typed without the currency symbol, e.g. ``'1.500,00'``.
+
+    Dots are treated as thousands separators and the single optional comma as
+    the decimal separator.
+
+    Args:
+        text (str): The amount to parse. Surrounding whitespace is ignored.
+
+    Returns:
+        float: The parsed value.
+
+    Raises:
+        BRLParseError: If the text is empty, has characters other than digits,
+            ``.``, ``,`` and ``-``, has more than one comma or is not a number.
+    """
+    text = text.strip()
+    if _BRL_PATTERN.fullmatch(text) is None:
+        if _INVALID_CHARACTER.search(text):
+            raise BRLParseError(INVALID_CHARACTERS, text)
+        raise BRLParseError(MULTIPLE_COMMAS, text)
+    if not text:
+        raise BRLParseError(EMPTY, text)
+    try:
+        return float(text.replace(".", "").replace(",", "."))
+    except ValueError:
+        raise BRLParseError(NOT_A_NUMBER, text) from None
+
+
+@lru_cache(maxsize=8)
+def _memoized(function, cache_size: int):
+    # One bounded cache per function and size, kept at module level so that
+    # repeated calls with the same ``cache_size`` share (and reuse) it.
+    return lru_cache(maxsize=cache_size)(function)
+
+
+def format_brl_many(values, cache_size: int = None) -> list:
+    """
+    Format many numbers as BRL currency.
+
+    Args:
+        values: Iterable of numeric values.
+        cache_size (int, optional): When set, results are memoized in a bounded
+            LRU cache of this size, which pays off when amounts repeat a lot.
+            The cache is shared by every call with the same size.
+
+    Returns:
+        list: Formatted strings aligned with ``values``.
+    """
+    if cache_size:
+        cached = _memoized(format_brl, cache_size)
+        # 0.0 and -0.0 are the same cache key but format differently, so
+        # zeros skip the cache.
+        return [format_brl(value) if value == 0 else cached(value) for value in values]
+    if not isinstance(values, (list, tuple)):
+        values = list(values)
+    if not values:
+        return []
+    joined = "\nR$ ".join([f"{value:,.2f}" for value in values])
+    return ("R$ " + joined).encode("ascii").translate(_TO_BRL).decode("ascii").split("\n")
+
+
+def parse_brl_many(texts, cache_size: int = None) -> list:
+    """
+    Parse many BRL amounts with the rules of `parse_brl`.
+
+    Args:
+        texts: Iterable of strings.
+        cache_size (int, optional): When set, results are memoized in a bounded
+            LRU cache of this size, which pays off when amounts repeat a lot.
+            The cache is shared by every call with the same size.
+
+    Returns:
+        list: Parsed floats aligned with ``texts``.
+
+    Raises:
+        BRLParseError: On the first invalid amount.
+    """
+    if cache_size:
+        return list(map(_memoized(parse_brl, cache_size), texts))
+    texts = [text.strip() for text in texts]
+    if not texts:
+        return []
+    # Fast path: validate and convert the whole batch as one string. Any
+    # problem falls back to parsing one by one, which raises the right error;
+    # so does a newline inside an amount, which would split it in two.
+    joined = "\n".join(texts)
+    if all(texts) and joined.count("\n") == len(texts) - 1 and _BRL_LINES_PATTERN.fullmatch(joined):
+        try:
+            return list(map(float, joined.replace(".", "").replace(",", ".").split("\n")))
+        except ValueError:
+            pass
+    return list(map(parse_brl, texts))
@@ -1,21 +1,129 @@
-def calculate(ticket_names: list, values: list, total_grade: float) -> dict:
+import heapq
+from bisect import bisect_right
+from array import array
+from collections.abc import Mapping
+
+MODES = ("float", "cents")
+# Usual cost components of a Brazilian brokerage note, keyed as in the "custos" record field.
+COST_COMPONENTS = ("corretagem", "emolumentos", "taxa_liquidacao", "iss")
+
+
+def to_cents(value: float) -> int:
     """
-    Calculate the proportional distribution of values based on ticket names.
+    Convert a monetary value to an integer number of cents, rounding half away from zero.
 
     Args:
-        ticket_names (list): A list of ticket names.
-        values (list): A list of corresponding values.
+        value (float): Monetary value in reais.
 
     Returns:
-        dict: A dictionary with ticket names as keys and their proportional values as values.
-    
+        int: The value in cents.
+    """
+    return int(value * 100 + (0.5 if value >= 0 else -0.5))
+
+
+def sequential_sum(values) -> float:
+    """
+    Add values one after another, from left to right.
+
+    Since Python 3.12, ``sum`` of floats uses compensated summation, so its
+    result depends on the interpreter version. This plain running total is
+    the same everywhere and matches the per-note totals of ``np.bincount``
+    in `batch.calculate_batch`, so both engines share their totals.
+
+    Args:
+        values (list): Numbers to add.
+
+    Returns:
+        float: Their sum.
+    """
+    total = 0.0
+    for value in values:
+        total += value
+    return total
+
+
+def allocate_cents(weights: list, amount: int) -> list:
+    """
+    Split an integer amount proportionally to integer weights, preserving the sum.
+
+    Each share is first floored, then the leftover units go one by one to the
+    shares with the largest remainders (ties go to the earliest position), so
+    the returned shares always add up exactly to ``amount``.
+
+    Args:
+        weights (list): Integer weights, e.g. asset values in cents.
+        amount (int): Integer amount to split, e.g. the note cost in cents.
+
+    Returns:
+        list: Integer shares aligned with ``weights``.
+
     Raises:
-        ValueError: If the total value of inputs is zero.
+        ValueError: If the weights add up to zero.
     """
-    total_value = sum(values)
+    denominator = sum(weights)
+    if denominator == 0:
+        raise ValueError("Total value of inputs cannot be zero.")
+    if denominator < 0:
+        weights = [-weight for weight in weights]
+        denominator = -denominator
+
+    magnitude = -amount if amount < 0 else amount
+    products = [magnitude * weight for weight in weights]
+    shares = [product // denominator for product in products]
+    remainders = [product % denominator for product in products]
+
+    # Remainders are in [0, denominator) and add up to a multiple of it,
+    # so the leftover is always smaller than the number of shares.
+    leftover = magnitude - sum(shares)
+    if leftover and leftover * 16 < len(shares):
+        # A few units: a heap of size ``leftover`` is cheapest.
+        for index in heapq.nlargest(leftover, range(len(shares)), key=remainders.__getitem__):
+            shares[index] += 1
+    elif leftover:
+        # Many units: one plain sort finds the smallest remainder that still
+        # gets a unit; ties at that remainder go to the earliest positions.
+        ordered = sorted(remainders)
+        threshold = ordered[len(ordered) - leftover]
+        ties = leftover - (len(ordered) - bisect_right(ordered, threshold))
+        shares = [share + 1 if remainder > threshold else share for share, remainder in zip(shares, remainders)]
+        for index, remainder in enumerate(remainders):
+            if not ties:
+                break
+            if remainder == threshold:
+                shares[index] += 1
+                ties -= 1
+
+    if amount < 0:
+        return [-share for share in shares]
+    return shares
+
+
+def merge_duplicates(ticket_names: list, values: list) -> tuple:
+    """
+    Merge repeated tickers of a note by summing their values.
+
+    Args:
+        ticket_names (list): A list of ticket names, possibly repeated.
+        values (list): A list of corresponding values.
+
+    Returns:
+        tuple: ``(ticket_names, values)`` with one entry per ticker, in order of
+               first appearance. The inputs are returned as-is when no ticker
+               repeats.
+    """
+    if len(set(ticket_names)) == len(ticket_names):
+        return ticket_names, values
+    merged = {}
+    for name, value in zip(ticket_names, values):
+        merged[name] = merged.get(name, 0) + value
+    return list(merged), list(merged.values())
+
+
+def _calculate_float(ticket_names: list, values: list, total_grade: float) -> dict:
+    total_value = sequential_sum(values)
     if total_value == 0:
         raise ValueError("Total value of inputs cannot be zero.")
-    
+
     new_values = {}
 
     for name, value in zip(ticket_names, values):
@@ -29,6 +137,244 @@ def calculate(ticket_names: list, values: list, total_grade: float) -> dict:
     return new_values
 
 
+def _float_columns(values: list, total_grade: float) -> tuple:
+    total_value = sequential_sum(values)
+    if total_value == 0:
+        raise ValueError("Total value of inputs cannot be zero.")
+
+    total_cost = total_grade - total_value
+    costs = [round(total_cost * (value / total_value), 2) for value in values]
+    return (
+        [round(value, 2) for value in values],
+        costs,
+        [round(cost + value, 2) for cost, value in zip(costs, values)],
+    )
+
+
+def _cents_columns(values: list, total_grade: float) -> tuple:
+    # to_cents, inlined: this runs once per asset.
+    value_cents = [int(value * 100 + (0.5 if value >= 0 else -0.5)) for value in values]
+    cost_cents = allocate_cents(value_cents, to_cents(total_grade) - sum(value_cents))
+    return (
+        [value / 100 for value in value_cents],
+        [cost / 100 for cost in cost_cents],
+        [(value + cost) / 100 for value, cost in zip(value_cents, cost_cents)],
+    )
+
+
+def _component_columns(values: list, amounts: list, mode: str) -> tuple:
+    # Returns the three usual columns plus one cost column per component.
+    if mode == "float":
+        total_value = sequential_sum(values)
+        if total_value == 0:
+            raise ValueError("Total value of inputs cannot be zero.")
+        # One N x K pass: each row shares its proportion across all components.
+        proportions = [value / total_value for value in values]
+        matrix = [[round(amount * proportion, 2) for amount in amounts] for proportion in proportions]
+        costs = [round(sum(row), 2) for row in matrix]
+        return (
+            [round(value, 2) for value in values],
+            costs,
+            [round(cost + value, 2) for cost, value in zip(costs, values)],
+            [list(column) for column in zip(*matrix)] if matrix else [[] for _ in amounts],
+        )
+
+    value_cents = [to_cents(value) for value in values]
+    columns = [allocate_cents(value_cents, to_cents(amount)) for amount in amounts]
+    cost_cents = [sum(row) for row in zip(*columns)] if columns else [0] * len(values)
+    return (
+        [value / 100 for value in value_cents],
+        [cost / 100 for cost in cost_cents],
+        [(value + cost) / 100 for value, cost in zip(value_cents, cost_cents)],
+        [[cost / 100 for cost in column] for column in columns],
+    )
+
+
+def _calculate_cents(ticket_names: list, values: list, total_grade: float) -> dict:
+    new_values = {}
+
+    for name, value, cost, value_cost in zip(ticket_names, *_cents_columns(values, total_grade)):
+        new_values[name] = {
+            'value': value,
+            'value_cost': value_cost,
+            'cost': cost
+        }
+    return new_values
+
+
+def calculate(ticket_names: list, values: list, total_grade: float, mode: str = "float") -> dict:
+    """
+    Calculate the proportional distribution of values based on ticket names.
+
+    A ticker that appears more than once is merged into a single entry with
+    the sum of its values (see `merge_duplicates`).
+
+    Args:
+        ticket_names (list): A list of ticket names.
+        values (list): A list of corresponding values.
+        total_grade (float): Total value of the note, costs included.
+        mode (str): ``'float'`` (default) rounds each asset's cost on its own, so
+            the costs may drift a few cents from the note total. ``'cents'``
+            works in integer cents and hands out the leftover cents by largest
+            remainder, so the costs always add up exactly to
+            ``total_grade - sum(values)``.
+
+    Returns:
+        dict: A dictionary with ticket names as keys and their proportional values as values.
+
+    Raises:
+        ValueError: If the total value of inputs is zero or the mode is unknown.
+    """
+    ticket_names, values = merge_duplicates(ticket_names, values)
+    if mode == "float":
+        return _calculate_float(ticket_names, values, total_grade)
+    if mode == "cents":
+        return _calculate_cents(ticket_names, values, total_grade)
+    raise ValueError(f"Unknown calculation mode: {mode!r}. Use one of {MODES}.")
+
+
+class Allocation(Mapping):
+    """
+    Compact, column-oriented result of `calculate_compact`.
+
+    Values, costs and final values are stored in parallel ``array('d')``
+    columns aligned with ``tickers`` instead of one dict per ticker. It still
+    behaves as a read-only mapping of ticker to the same dict `calculate`
+    returns (built on access), and `to_dict` gives the full legacy structure.
+    The ticker index behind the mapping is only built on first lookup.
+
+    Results of `calculate_components` also keep one cost column per component
+    in ``components``, and each ticker's dict gains a ``'costs'`` breakdown.
+    """
+
+    __slots__ = ("tickers", "values", "costs", "value_costs", "components", "_index")
+
+    def __init__(self, tickers: list, values, costs, value_costs, components: dict = None):
+        self.tickers = tickers
+        self.values = array('d', values)
+        self.costs = array('d', costs)
+        self.value_costs = array('d', value_costs)
+        self.components = {name: array('d', column) for name, column in (components or {}).items()}
+        self._index = None
+
+    @property
+    def index(self) -> dict:
+        """Ticker to row position; if rows were built with a repeated ticker, it maps to the last one."""
+        if self._index is None:
+            self._index = {ticker: position for position, ticker in enumerate(self.tickers)}
+        return self._index
+
+    def __getitem__(self, ticker: str) -> dict:
+        position = self.index[ticker]
+        data = {
+            'value': self.values[position],
+            'value_cost': self.value_costs[position],
+            'cost': self.costs[position]
+        }
+        if self.components:
+            data['costs'] = {name: column[position] for name, column in self.components.items()}
+        return data
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def rows(self):
+        """
+        Iterate over the result rows in input order, without building dicts.
+
+        Yields:
+            tuple: ``(ticker, value, cost, value_cost)`` for each input line.
+        """
+        return zip(self.tickers, self.values, self.costs, self.value_costs)
+
+    def breakdown_rows(self):
+        """
+        Like `rows`, followed by the cost of each component, in ``components`` order.
+
+        Yields:
+            tuple: ``(ticker, value, cost, value_cost, *component_costs)``.
+        """
+        return zip(self.tickers, self.values, self.costs, self.value_costs, *self.components.values())
+
+    def to_dict(self) -> dict:
+        """
+        Convert to the dict-of-dicts structure returned by `calculate`.
+
+        Returns:
+            dict: Ticker names mapped to ``value``, ``value_cost`` and ``cost``.
+        """
+        return {ticker: self[ticker] for ticker in self.index}
+
+
+def calculate_compact(ticket_names: list, values: list, total_grade: float, mode: str = "float") -> Allocation:
+    """
+    Calculate the proportional distribution into a compact `Allocation`.
+
+    Same arithmetic, modes and duplicate merging as `calculate`, but the
+    result is kept in parallel columns, which takes far less memory and
+    allocation time for large notes.
+
+    Args:
+        ticket_names (list): A list of ticket names.
+        values (list): A list of corresponding values.
+        total_grade (float): Total value of the note, costs included.
+        mode (str): ``'float'`` (default) or ``'cents'``, as in `calculate`.
+
+    Returns:
+        Allocation: Mapping-like result; ``to_dict()`` equals `calculate`'s output.
+
+    Raises:
+        ValueError: If the total value of inputs is zero or the mode is unknown.
+    """
+    ticket_names, values = merge_duplicates(ticket_names, values)
+    if mode == "float":
+        columns = _float_columns(values, total_grade)
+    elif mode == "cents":
+        columns = _cents_columns(values, total_grade)
+    else:
+        raise ValueError(f"Unknown calculation mode: {mode!r}. Use one of {MODES}.")
+    return Allocation(list(ticket_names), *columns)
+
+
+def calculate_components(ticket_names: list, values: list, components: dict, mode: str = "float") -> Allocation:
+    """
+    Allocate several named cost components across the assets in one pass.
+
+    Each asset's proportion of the note is computed once and applied to every
+    component, giving an N x K matrix of costs, instead of calling `calculate`
+    once per component. The note total is ``sum(values) + sum(components)``.
+
+    Args:
+        ticket_names (list): A list of ticket names (repeated tickers are merged).
+        values (list): A list of corresponding values.
+        components (dict): Component name to its amount in the note, e.g.
+            ``{"corretagem": 10.0, "emolumentos": 0.35}`` (see `COST_COMPONENTS`).
+        mode (str): ``'float'`` rounds each component cost on its own;
+            ``'cents'`` makes every component add up exactly to its amount.
+
+    Returns:
+        Allocation: Result whose ``cost`` is the sum of the component costs, with
+            the per-component columns in ``components``.
+
+    Raises:
+        ValueError: If the total value of inputs is zero or the mode is unknown.
+
+    Example:
+        >>> result = calculate_components(["AAA", "BBB"], [100.0, 300.0], {"corretagem": 4.0, "iss": 0.4})
+        >>> result["BBB"]
+        {'value': 300.0, 'value_cost': 303.3, 'cost': 3.3, 'costs': {'corretagem': 3.0, 'iss': 0.3}}
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown calculation mode: {mode!r}. Use one of {MODES}.")
+    ticket_names, values = merge_duplicates(ticket_names, values)
+    names = list(components)
+    *columns, matrix = _component_columns(values, [components[name] for name in names], mode)
+    return Allocation(list(ticket_names), *columns, dict(zip(names, matrix)))
+
+
 if __name__ == "__main__":
     # Example usage
     tickets = ["AAA", "BBB", "CCC"]
@@ -39,4 +385,4 @@ if __name__ == "__main__":
     for ticket, data in result.items():
         print(f"{ticket}: {data}")
 
-    print(result)
\ No newline at end of file
+    print(result)
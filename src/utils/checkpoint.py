@@ -0,0 +1,186 @@
+import hashlib
+import os
+import struct
+from collections import deque
+
+from .streams import NOTE_ERRORS, note_components, note_from_record
+
+DIGEST_SIZE = 16
+_MAGIC = b"CDADIGS1"
+_HEADER = struct.Struct("<8sI")
+
+
+def note_fingerprint(note_id, ticket_names: list, values: list, total_grade: float, mode: str = "float",
+                     components: dict = None) -> bytes:
+    """
+    Fingerprint a note from its id, inputs and calculation mode.
+
+    Any change to a ticker, a value, the total, a cost component or the mode
+    gives a different fingerprint. Floats are hashed through ``repr``, which
+    round-trips exactly, so equal inputs always give equal fingerprints.
+
+    Args:
+        note_id: Identifier of the note.
+        ticket_names (list): Tickers of the note.
+        values (list): Values of the note.
+        total_grade (float): Total value of the note, costs included.
+        mode (str): Calculation mode.
+        components (dict, optional): Cost component amounts of the note.
+
+    Returns:
+        bytes: A `DIGEST_SIZE`-byte BLAKE2b digest.
+    """
+    parts = [mode, str(note_id), repr(float(total_grade))]
+    for ticker, value in zip(ticket_names, values):
+        parts.append(ticker)
+        parts.append(repr(float(value)))
+    for name, amount in sorted((components or {}).items()):
+        parts.append(f"custo:{name}")
+        parts.append(repr(float(amount)))
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+
+class DigestSet:
+    """
+    Persistent set of fixed-size digests stored in an append-only file.
+
+    The file is a short header followed by the raw digests, so opening it is
+    a single read. New digests are kept in memory until `flush`, which appends
+    them and syncs the file. A torn trailing record (from a crash while
+    appending) is ignored on load.
+
+    Example:
+        >>> with DigestSet("done.digests") as done:
+        ...     if digest not in done:
+        ...         done.add(digest)
+    """
+
+    def __init__(self, path: str, digest_size: int = DIGEST_SIZE):
+        self.path = path
+        self.digest_size = digest_size
+        self._digests = set()
+        self._pending = []
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as handle:
+                data = handle.read()
+            magic, stored_size = _HEADER.unpack_from(data, 0)
+            if magic != _MAGIC or stored_size != digest_size:
+                raise ValueError(f"{path} is not a digest file with {digest_size}-byte digests.")
+            end = len(data) - (len(data) - _HEADER.size) % digest_size
+            self._digests = {data[offset:offset + digest_size] for offset in range(_HEADER.size, end, digest_size)}
+            if end != len(data):
+                with open(path, "r+b") as handle:
+                    handle.truncate(end)
+        else:
+            with open(path, "wb") as handle:
+                handle.write(_HEADER.pack(_MAGIC, digest_size))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __contains__(self, digest: bytes) -> bool:
+        return digest in self._digests
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+    def add(self, digest: bytes) -> bool:
+        """
+        Add a digest; it is written to disk on the next `flush`.
+
+        Returns:
+            bool: True if the digest was new.
+        """
+        if digest in self._digests:
+            return False
+        self._digests.add(digest)
+        self._pending.append(digest)
+        return True
+
+    def flush(self) -> None:
+        """Append the new digests to the file and sync it to disk."""
+        if not self._pending:
+            return
+        with open(self.path, "ab") as handle:
+            handle.write(b"".join(self._pending))
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._pending = []
+
+    def close(self) -> None:
+        """Flush the new digests."""
+        self.flush()
+
+
+class Checkpoint:
+    """
+    Skips notes completed by earlier runs and records newly completed ones.
+
+    `pending` filters the input, and the caller reports each result in the
+    same order through `completed`. Fingerprints are only committed to the
+    store after the caller has flushed the matching output, so a crash can
+    re-emit the last few notes but never lose one.
+
+    Example:
+        >>> checkpoint = Checkpoint("run.digests", mode="float")
+        >>> for note_id, result, error in calculate_notes(checkpoint.pending(notes)):
+        ...     write(result)
+        ...     if checkpoint.completed(error is None):
+        ...         output.flush()
+        ...         checkpoint.commit()
+        >>> output.flush()
+        >>> checkpoint.commit()
+    """
+
+    def __init__(self, path: str, mode: str = "float", commit_every: int = 1000):
+        self.mode = mode
+        self.commit_every = commit_every
+        self.digests = DigestSet(path)
+        self.skipped = 0
+        self._fingerprints = deque()
+        self._staged = []
+
+    def pending(self, notes):
+        """
+        Yield only the ``(note_id, record)`` pairs not completed before.
+
+        Notes that cannot be parsed are passed through, so the calculation
+        reports their error; they are never recorded as completed.
+        """
+        for note_id, record in notes:
+            try:
+                fingerprint = note_fingerprint(
+                    note_id, *note_from_record(record), self.mode, note_components(record)
+                )
+            except NOTE_ERRORS:
+                fingerprint = None
+            if fingerprint is not None and fingerprint in self.digests:
+                self.skipped += 1
+                continue
+            self._fingerprints.append(fingerprint)
+            yield note_id, record
+
+    def completed(self, ok: bool) -> bool:
+        """
+        Mark the oldest pending note as handled.
+
+        Args:
+            ok (bool): Whether its result was written (errors are not recorded).
+
+        Returns:
+            bool: True when ``commit_every`` notes are staged and `commit` is due.
+        """
+        fingerprint = self._fingerprints.popleft()
+        if ok and fingerprint is not None:
+            self._staged.append(fingerprint)
+        return len(self._staged) >= self.commit_every
+
+    def commit(self) -> None:
+        """Record the staged notes as completed; call after flushing the output."""
+        for fingerprint in self._staged:
+            self.digests.add(fingerprint)
+        self._staged = []
+        self.digests.flush()
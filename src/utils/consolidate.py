@@ -0,0 +1,112 @@
+from .calcula import Allocation, calculate_compact
+
+CONSOLIDATED_FIELDS = ("ticker", "notes", "value", "cost", "value_cost", "cost_share", "cost_rate")
+
+
+class Consolidation:
+    """
+    Per-ticker totals over many calculated notes, aggregated in one pass.
+
+    Each note is allocated on its own (duplicate lines merged), then its rows
+    are added to a hash table keyed by ticker, so the work is linear in the
+    number of rows and memory grows only with the number of distinct tickers.
+
+    Example:
+        >>> consolidation = Consolidation()
+        >>> consolidation.add(calculate(["AAA", "BBB"], [100.0, 200.0], 303.0))
+        >>> consolidation.add(calculate(["AAA"], [50.0], 51.0))
+        >>> consolidation.result()["AAA"]["cost"]
+        2.0
+    """
+
+    def __init__(self):
+        self.notes = 0
+        self._positions = {}
+
+    def add(self, result) -> None:
+        """
+        Add one note's allocation.
+
+        Args:
+            result: Mapping of ticker to ``value``, ``cost`` and ``value_cost``,
+                as returned by `calculate` or `calculate_compact`.
+        """
+        if isinstance(result, Allocation):
+            rows = result.rows()
+        else:
+            rows = ((ticker, data['value'], data['cost'], data['value_cost']) for ticker, data in result.items())
+        positions = self._positions
+        for ticker, value, cost, value_cost in rows:
+            position = positions.get(ticker)
+            if position is None:
+                positions[ticker] = [1, value, cost, value_cost]
+            else:
+                position[0] += 1
+                position[1] += value
+                position[2] += cost
+                position[3] += value_cost
+        self.notes += 1
+
+    def result(self) -> dict:
+        """
+        Return the consolidated totals.
+
+        Returns:
+            dict: Ticker (in order of first appearance) mapped to ``notes``
+                  (number of notes with the ticker), ``value``, ``cost`` and
+                  ``value_cost`` totals, ``cost_share`` (fraction of all costs
+                  paid by the ticker) and ``cost_rate`` (cost per real
+                  invested, None when the total value is zero).
+        """
+        total_cost = sum(position[2] for position in self._positions.values())
+        consolidated = {}
+        for ticker, (notes, value, cost, value_cost) in self._positions.items():
+            consolidated[ticker] = {
+                'notes': notes,
+                'value': round(value, 2),
+                'cost': round(cost, 2),
+                'value_cost': round(value_cost, 2),
+                'cost_share': cost / total_cost if total_cost else 0.0,
+                'cost_rate': cost / value if value else None,
+            }
+        return consolidated
+
+
+def consolidate(notes, mode: str = "float") -> dict:
+    """
+    Allocate costs note by note and aggregate the results by ticker.
+
+    Args:
+        notes: Iterable of ``(ticket_names, values, total_grade)`` tuples, the
+            `calculate` arguments of each note. Tickers repeated within a note
+            are merged.
+        mode (str): Calculation mode, as in `calculate`.
+
+    Returns:
+        dict: See `Consolidation.result`.
+
+    Raises:
+        ValueError: If a note's total value is zero or the mode is unknown.
+
+    Example:
+        >>> consolidate([(["AAA", "AAA"], [100.0, 50.0], 153.0), (["AAA"], [50.0], 51.0)])["AAA"]
+        {'notes': 2, 'value': 200.0, 'cost': 4.0, 'value_cost': 204.0, 'cost_share': 1.0, 'cost_rate': 0.02}
+    """
+    consolidation = Consolidation()
+    for ticket_names, values, total_grade in notes:
+        consolidation.add(calculate_compact(ticket_names, values, total_grade, mode=mode))
+    return consolidation.result()
+
+
+def iter_consolidated_rows(consolidated: dict):
+    """
+    Flatten a consolidation into output rows.
+
+    Args:
+        consolidated (dict): Result of `consolidate` or `Consolidation.result`.
+
+    Yields:
+        dict: One row per ticker with the keys in `CONSOLIDATED_FIELDS`.
+    """
+    for ticker, data in consolidated.items():
+        yield {"ticker": ticker, **data}
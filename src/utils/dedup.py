@@ -0,0 +1,109 @@
+import hashlib
+
+from .calcula import to_cents
+from .checkpoint import DIGEST_SIZE, DigestSet
+from .streams import NOTE_ERRORS, note_components, note_from_record
+
+
+def note_signature(record: dict) -> bytes:
+    """
+    Signature of a note's content, independent of its id and item order.
+
+    The note is parsed with `note_from_record`, exactly as the calculation
+    reads it, so only notes that would be calculated get a signature. Two
+    notes get the same signature when they have the same ticker/value pairs
+    (in any order) and the same total, with amounts compared in cents. The
+    note id is left out on purpose: the same note usually comes back under
+    another id or line number when a file is downloaded again.
+
+    Args:
+        record (dict): Note in the `data/demo_data.json` schema.
+
+    Returns:
+        bytes: A `DIGEST_SIZE`-byte BLAKE2b digest.
+
+    Raises:
+        KeyError, TypeError, ValueError: If the note is malformed.
+    """
+    ticket_names, values, total_grade = note_from_record(record)
+    pairs = sorted(zip(ticket_names, (to_cents(value) for value in values)))
+    parts = [f"{ticker}={cents}" for ticker, cents in pairs]
+    parts.append(f"total={to_cents(total_grade)}")
+    for name, amount in sorted((note_components(record) or {}).items()):
+        parts.append(f"custo:{name}={to_cents(amount)}")
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+
+class NoteIndex:
+    """
+    Index of note signatures that drops notes already seen.
+
+    Each note costs one signature and one hash-set lookup, so filtering is
+    O(1) per note. With ``path`` the signatures are kept in a `DigestSet`, so
+    notes seen by earlier runs (other files, re-downloads) are dropped too;
+    new signatures are written by `flush` or `close`, which the caller should
+    only reach once the run succeeded (the context manager skips them on an
+    exception).
+
+    Example:
+        >>> with NoteIndex("notas.dedup") as index:
+        ...     for note_id, record in index.unique(read_jsonl_notes(handle)):
+        ...         ...
+        >>> index.dropped
+        3
+    """
+
+    def __init__(self, path: str = None):
+        self.dropped = 0
+        self._seen = DigestSet(path) if path else set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # A failed run must not mark its notes as seen.
+        if exc_type is None:
+            self.close()
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def add(self, signature: bytes) -> bool:
+        """
+        Record a signature.
+
+        Returns:
+            bool: True if it was new, False for a duplicate.
+        """
+        if signature in self._seen:
+            return False
+        self._seen.add(signature)
+        return True
+
+    def unique(self, notes):
+        """
+        Yield the ``(note_id, record)`` pairs whose content was not seen before.
+
+        Duplicates are counted in ``dropped``. Notes that cannot be parsed are
+        passed through without being recorded, so the calculation reports
+        their error and a later valid copy of the same note is still kept.
+        """
+        for note_id, record in notes:
+            try:
+                signature = note_signature(record)
+            except NOTE_ERRORS:
+                yield note_id, record
+                continue
+            if self.add(signature):
+                yield note_id, record
+            else:
+                self.dropped += 1
+
+    def flush(self) -> None:
+        """Write the new signatures to the index file, if there is one."""
+        if isinstance(self._seen, DigestSet):
+            self._seen.flush()
+
+    def close(self) -> None:
+        """Flush the new signatures."""
+        self.flush()
@@ -1,4 +1,3 @@
-def format_brl(value: float) -> str:
-    formatted = f"{value:,.2f}"
-    formatted = formatted.replace(",", "_").replace(".", ",").replace("_", ".")
-    return f"R$ {formatted}"
+from .brl import format_brl, format_brl_many
+
+__all__ = ["format_brl", "format_brl_many"]
@@ -0,0 +1,201 @@
+import datetime
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    note_id TEXT,
+    date TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    value REAL NOT NULL,
+    cost REAL NOT NULL,
+    value_cost REAL NOT NULL,
+    quantity REAL
+);
+CREATE INDEX IF NOT EXISTS entries_ticker_date ON entries (ticker, date);
+CREATE INDEX IF NOT EXISTS entries_date ON entries (date);
+CREATE TABLE IF NOT EXISTS positions (
+    ticker TEXT PRIMARY KEY,
+    entries INTEGER NOT NULL,
+    total_value REAL NOT NULL,
+    total_cost REAL NOT NULL,
+    total_value_cost REAL NOT NULL,
+    quantity REAL NOT NULL,
+    quantity_value_cost REAL NOT NULL,
+    last_date TEXT NOT NULL
+);
+"""
+
+_INSERT_ENTRY = (
+    "INSERT INTO entries (note_id, date, ticker, value, cost, value_cost, quantity) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_UPSERT_POSITION = """
+INSERT INTO positions (ticker, entries, total_value, total_cost, total_value_cost,
+                       quantity, quantity_value_cost, last_date)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (ticker) DO UPDATE SET
+    entries = entries + excluded.entries,
+    total_value = total_value + excluded.total_value,
+    total_cost = total_cost + excluded.total_cost,
+    total_value_cost = total_value_cost + excluded.total_value_cost,
+    quantity = quantity + excluded.quantity,
+    quantity_value_cost = quantity_value_cost + excluded.quantity_value_cost,
+    last_date = max(last_date, excluded.last_date)
+"""
+_POSITION_FIELDS = (
+    "ticker", "entries", "total_value", "total_cost", "total_value_cost",
+    "quantity", "quantity_value_cost", "last_date",
+)
+
+
+class Ledger:
+    """
+    Persistent SQLite ledger of calculated notes with per-ticker aggregates.
+
+    Every result row is stored in ``entries`` (indexed by ticker and date),
+    and the running totals of each ticker are kept up to date in
+    ``positions``, so reading a position never rescans the history. Writes are
+    buffered with `add` and written in a single transaction by `flush`.
+
+    Brokerage notes carry values but not quantities, so the average price
+    (preço médio) is only available for tickers recorded with quantities;
+    `position` always reports the cost-inclusive totals and cost rate.
+
+    Example:
+        >>> with Ledger("ledger.db") as ledger:
+        ...     ledger.record(calculate(["PETR4"], [1000.0], 1010.0), quantities={"PETR4": 100})
+        ...     ledger.average_price("PETR4")
+        10.1
+    """
+
+    def __init__(self, path: str = ":memory:", batch_size: int = 1000):
+        self.batch_size = batch_size
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(SCHEMA)
+        self._entries = []
+        self._positions = {}
+        self._pending_notes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, result, date: str = None, note_id=None, quantities: dict = None) -> None:
+        """
+        Buffer a `calculate` result; it is written on the next `flush`.
+
+        The buffer is flushed automatically every ``batch_size`` notes.
+
+        Args:
+            result: Mapping of ticker to ``value``, ``cost`` and ``value_cost``,
+                as returned by `calculate` or `calculate_compact`.
+            date (str, optional): ISO date of the note (default: today).
+            note_id (optional): Identifier of the note.
+            quantities (dict, optional): Ticker to quantity bought, to track
+                the average price.
+        """
+        date = date or datetime.date.today().isoformat()
+        note_id = None if note_id is None else str(note_id)
+        quantities = quantities or {}
+        for ticker, data in result.items():
+            quantity = quantities.get(ticker)
+            self._entries.append(
+                (note_id, date, ticker, data['value'], data['cost'], data['value_cost'], quantity)
+            )
+            position = self._positions.get(ticker)
+            if position is None:
+                position = self._positions[ticker] = [0, 0.0, 0.0, 0.0, 0.0, 0.0, date]
+            position[0] += 1
+            position[1] += data['value']
+            position[2] += data['cost']
+            position[3] += data['value_cost']
+            if quantity:
+                position[4] += quantity
+                position[5] += data['value_cost']
+            if date > position[6]:
+                position[6] = date
+        self._pending_notes += 1
+        if self._pending_notes >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered notes and their aggregates in one transaction."""
+        if not self._entries:
+            return
+        with self._connection:
+            self._connection.executemany(_INSERT_ENTRY, self._entries)
+            self._connection.executemany(
+                _UPSERT_POSITION,
+                [(ticker, *position) for ticker, position in self._positions.items()],
+            )
+        self._entries = []
+        self._positions = {}
+        self._pending_notes = 0
+
+    def record(self, result, date: str = None, note_id=None, quantities: dict = None) -> None:
+        """Add a single result and write it immediately (see `add`)."""
+        self.add(result, date, note_id, quantities)
+        self.flush()
+
+    def position(self, ticker: str):
+        """
+        Return the aggregated position of a ticker, without rescanning history.
+
+        Args:
+            ticker (str): Ticker to look up.
+
+        Returns:
+            dict: ``entries``, ``total_value``, ``total_cost``,
+                  ``total_value_cost``, ``quantity``, ``cost_rate`` (cost per
+                  real invested), ``average_price`` (None without quantities)
+                  and ``last_date``; or None if the ticker was never recorded.
+        """
+        self.flush()
+        row = self._connection.execute(
+            f"SELECT {', '.join(_POSITION_FIELDS)} FROM positions WHERE ticker = ?", (ticker,)
+        ).fetchone()
+        if row is None:
+            return None
+        position = dict(zip(_POSITION_FIELDS, row))
+        quantity_value_cost = position.pop("quantity_value_cost")
+        total_value = position["total_value"]
+        position["cost_rate"] = position["total_cost"] / total_value if total_value else None
+        position["average_price"] = quantity_value_cost / position["quantity"] if position["quantity"] else None
+        return position
+
+    def average_price(self, ticker: str):
+        """
+        Return the cost-inclusive average price of a ticker.
+
+        Returns:
+            float: Average price, or None if no quantities were recorded.
+        """
+        position = self.position(ticker)
+        return None if position is None else position["average_price"]
+
+    def history(self, ticker: str, start: str = None, end: str = None) -> list:
+        """
+        Return the recorded entries of a ticker, optionally within a date range.
+
+        Args:
+            ticker (str): Ticker to look up.
+            start (str, optional): First ISO date to include.
+            end (str, optional): Last ISO date to include.
+
+        Returns:
+            list: ``(date, note_id, value, cost, value_cost, quantity)`` tuples by date.
+        """
+        self.flush()
+        return self._connection.execute(
+            "SELECT date, note_id, value, cost, value_cost, quantity FROM entries "
+            "WHERE ticker = ? AND date >= ? AND date <= ? ORDER BY date, id",
+            (ticker, start or "", end or "9999-12-31"),
+        ).fetchall()
+
+    def close(self) -> None:
+        """Flush pending notes and close the database."""
+        self.flush()
+        self._connection.close()
@@ -0,0 +1,171 @@
+from .calcula import MODES, Allocation, calculate_compact, calculate_components, sequential_sum
+
+
+class Note:
+    """
+    A brokerage note that can be edited one asset at a time.
+
+    The note keeps a running total of the asset values, so every edit costs
+    O(1) and so does reading the cost of a single asset in ``'float'`` mode.
+    Adding assets keeps the total equal to the one `calculate` computes;
+    after an update or a removal it is recomputed (once) the next time it is
+    read, so `cost` never drifts from `result`, even with large values.
+    The full result (a compact `Allocation`) is only built when it is read,
+    and is cached until the next edit. The note cost can be a single total
+    (`set_total`) or split into named components (`set_components`).
+
+    Example:
+        >>> note = Note(total_grade=350.0)
+        >>> note.add_asset("AAA", 100.0)
+        >>> note.add_asset("BBB", 200.0)
+        >>> note.cost("AAA")
+        16.67
+        >>> note.update_value("BBB", 300.0)
+        >>> note.cost("AAA")
+        -12.5
+    """
+
+    def __init__(self, total_grade: float = 0.0, mode: str = "float"):
+        if mode not in MODES:
+            raise ValueError(f"Unknown calculation mode: {mode!r}. Use one of {MODES}.")
+        self._values = {}
+        self._total_value = 0.0
+        self._total_stale = False
+        self._total_grade = total_grade
+        self._components = None
+        self._result = None
+        self.mode = mode
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._values
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __getitem__(self, ticker: str) -> dict:
+        return self.result()[ticker]
+
+    @property
+    def total_value(self) -> float:
+        """Sum of the asset values, without costs."""
+        if self._total_stale:
+            # Added in note order, exactly like `calculate` does.
+            self._total_value = sequential_sum(self._values.values())
+            self._total_stale = False
+        return self._total_value
+
+    @property
+    def total_grade(self) -> float:
+        """Total value of the note, costs included."""
+        if self._components is not None:
+            return self.total_value + sum(self._components.values())
+        return self._total_grade
+
+    @property
+    def components(self):
+        """Cost component amounts set with `set_components`, or None."""
+        return self._components
+
+    def value(self, ticker: str) -> float:
+        """
+        Return the value of an asset, without cost.
+
+        Raises:
+            KeyError: If the ticker is not in the note.
+        """
+        return self._values[ticker]
+
+    def add_asset(self, ticker: str, value: float) -> None:
+        """
+        Add an asset to the note.
+
+        Raises:
+            ValueError: If the ticker is already in the note.
+        """
+        if ticker in self._values:
+            raise ValueError(f"Ticker {ticker} is already in the note; use update_value.")
+        self._values[ticker] = value
+        self._total_value += value
+        self._result = None
+
+    def update_value(self, ticker: str, value: float) -> None:
+        """
+        Change the value of an asset already in the note.
+
+        Raises:
+            KeyError: If the ticker is not in the note.
+        """
+        if ticker not in self._values:
+            raise KeyError(ticker)
+        self._values[ticker] = value
+        self._total_stale = True
+        self._result = None
+
+    def remove_asset(self, ticker: str) -> None:
+        """
+        Remove an asset from the note.
+
+        Raises:
+            KeyError: If the ticker is not in the note.
+        """
+        del self._values[ticker]
+        self._total_stale = True
+        self._result = None
+
+    def set_total(self, total_grade: float) -> None:
+        """Change the total value of the note, costs included (drops any components)."""
+        self._total_grade = total_grade
+        self._components = None
+        self._result = None
+
+    def set_components(self, components: dict) -> None:
+        """
+        Split the note cost into named components, e.g. ``{"corretagem": 10.0}``.
+
+        The total of the note then follows the asset values, and the result
+        carries the per-component breakdown (see `calculate_components`).
+        """
+        self._components = dict(components)
+        self._result = None
+
+    def cost(self, ticker: str) -> float:
+        """
+        Return the cost allocated to one asset.
+
+        In ``'float'`` mode this is O(1) and uses the same arithmetic as
+        `calculate`. In ``'cents'`` mode, or with cost components, the full
+        result is built (and cached) instead.
+
+        Raises:
+            KeyError: If the ticker is not in the note.
+            ValueError: If the total value of the note is zero.
+        """
+        if self.mode != "float" or self._components is not None or self._result is not None:
+            return self.result()[ticker]['cost']
+        value = self._values[ticker]
+        total_value = self.total_value
+        if total_value == 0:
+            raise ValueError("Total value of inputs cannot be zero.")
+        return round((self._total_grade - total_value) * (value / total_value), 2)
+
+    def result(self) -> Allocation:
+        """
+        Return the full allocation for the note, building it if needed.
+
+        Returns:
+            Allocation: Mapping equal to what `calculate` returns for this note.
+
+        Raises:
+            ValueError: If the total value of the note is zero.
+        """
+        if self._result is None:
+            tickers = list(self._values)
+            values = list(self._values.values())
+            if self._components is not None:
+                self._result = calculate_components(tickers, values, self._components, mode=self.mode)
+            else:
+                self._result = calculate_compact(tickers, values, self._total_grade, mode=self.mode)
+        return self._result
@@ -0,0 +1,108 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .streams import calculate_notes
+
+
+def chunked(iterable, size: int):
+    """
+    Split an iterable into lists of at most ``size`` elements, lazily.
+
+    Args:
+        iterable: Any iterable.
+        size (int): Maximum chunk length.
+
+    Yields:
+        list: The next chunk.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _process_chunk(chunk: list, mode: str) -> tuple:
+    start = time.perf_counter()
+    results = list(calculate_notes(chunk, mode))
+    return os.getpid(), results, time.perf_counter() - start
+
+
+class ParallelStats:
+    """Per-worker and overall throughput of a parallel run."""
+
+    def __init__(self):
+        self.workers = {}
+        self.notes = 0
+        self.wall_time = 0.0
+
+    def record(self, pid: int, notes: int, seconds: float) -> None:
+        worker = self.workers.setdefault(pid, {"chunks": 0, "notes": 0, "seconds": 0.0})
+        worker["chunks"] += 1
+        worker["notes"] += notes
+        worker["seconds"] += seconds
+        self.notes += notes
+
+    def summary(self) -> str:
+        """
+        Format a human-readable throughput report.
+
+        Returns:
+            str: One line per worker plus a total line with wall-clock throughput.
+        """
+        lines = []
+        for pid, worker in sorted(self.workers.items()):
+            rate = worker["notes"] / worker["seconds"] if worker["seconds"] else 0.0
+            lines.append(
+                f"worker {pid}: {worker['chunks']} chunks, {worker['notes']} notes, "
+                f"{worker['seconds']:.3f} s busy, {rate:,.0f} notes/s"
+            )
+        rate = self.notes / self.wall_time if self.wall_time else 0.0
+        lines.append(
+            f"total: {len(self.workers)} workers, {self.notes} notes, "
+            f"{self.wall_time:.3f} s wall, {rate:,.0f} notes/s"
+        )
+        return "\n".join(lines)
+
+
+def run_parallel(notes, workers: int = None, chunk_size: int = 1000,
+                 mode: str = "float", stats: ParallelStats = None):
+    """
+    Run `calculate` over notes in a process pool, yielding results in input order.
+
+    Notes are sent to the workers in chunks and at most two chunks per worker
+    are in flight at once, so memory stays bounded for inputs of any size.
+
+    Args:
+        notes: Iterable of ``(note_id, record)`` pairs in the `demo_data.json` schema.
+        workers (int, optional): Number of worker processes (default: CPU count).
+        chunk_size (int): Number of notes sent to a worker at a time.
+        mode (str): Calculation mode passed to `calculate`.
+        stats (ParallelStats, optional): Collects per-worker throughput if given.
+
+    Yields:
+        tuple: ``(note_id, result, error)`` as in `calculate_notes`.
+    """
+    if stats is None:
+        stats = ParallelStats()
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunked(notes, chunk_size):
+            pending.append(executor.submit(_process_chunk, chunk, mode))
+            if len(pending) >= workers * 2:
+                yield from _collect(pending.popleft(), stats)
+        while pending:
+            yield from _collect(pending.popleft(), stats)
+    stats.wall_time = time.perf_counter() - start
+
+
+def _collect(future, stats: ParallelStats):
+    pid, results, seconds = future.result()
+    stats.record(pid, len(results), seconds)
+    return results
@@ -0,0 +1,141 @@
+import time
+from contextlib import nullcontext
+
+# Returned by every `stage` call while profiling is off: no allocation, no clock reads.
+_DISABLED = nullcontext()
+
+
+class _Stage:
+    __slots__ = ("_profiler", "_totals", "_start")
+
+    def __init__(self, profiler, totals: list):
+        self._profiler = profiler
+        self._totals = totals
+
+    def __enter__(self):
+        if self._profiler._depth:
+            self._totals[2] += 1
+        self._profiler._depth += 1
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._totals[0] += 1
+        self._totals[1] += time.perf_counter() - self._start
+        self._profiler._depth -= 1
+
+
+class Profiler:
+    """
+    Per-stage timers and counters for a run, plus an optional cProfile dump.
+
+    While disabled (the default), `stage` returns a shared no-op context
+    manager and `count` returns immediately, so instrumented code pays only
+    for the method call.
+
+    Example:
+        >>> profiler = Profiler()
+        >>> profiler.enable()
+        >>> with profiler.stage("calculate"):
+        ...     result = calculate(tickers, values, total)
+        >>> profiler.count("notes")
+        >>> print(profiler.finish())
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.stages = {}
+        self.counters = {}
+        self._start = None
+        self._depth = 0
+        self._cprofile = None
+        self._dump_path = None
+
+    def enable(self, dump_path: str = None) -> None:
+        """
+        Start collecting timings.
+
+        Args:
+            dump_path (str, optional): Also run cProfile and write its stats
+                (readable with `pstats`) to this file on `finish`.
+        """
+        self.enabled = True
+        self._start = time.perf_counter()
+        if dump_path:
+            import cProfile
+
+            self._dump_path = dump_path
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stage(self, name: str):
+        """Context manager that adds the time spent inside it to stage ``name``."""
+        if not self.enabled:
+            return _DISABLED
+        totals = self.stages.get(name)
+        if totals is None:
+            totals = self.stages[name] = [0, 0.0, 0]
+        return _Stage(self, totals)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add ``amount`` to counter ``name``."""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def iterate(self, name: str, iterable):
+        """
+        Time every step of a lazy iterable as stage ``name``.
+
+        Returns the iterable itself while disabled.
+        """
+        if not self.enabled:
+            return iterable
+        return self._timed_iter(name, iter(iterable))
+
+    def _timed_iter(self, name: str, iterator):
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def report(self) -> str:
+        """
+        Format the per-stage breakdown.
+
+        Returns:
+            str: One line per stage (calls, total and mean time, share of the
+                 wall-clock time since `enable`), then the counters. A stage
+                 that ran inside another one is marked ``nested`` instead of
+                 getting a share, since its time is already part of the outer
+                 stage; the shares of the other stages never add up past 100%.
+        """
+        wall = time.perf_counter() - self._start if self._start is not None else 0.0
+        lines = [f"{'stage':<20} {'calls':>9} {'total ms':>11} {'mean us':>10} {'wall %':>7}"]
+        for name, (calls, seconds, nested) in sorted(self.stages.items(), key=lambda entry: -entry[1][1]):
+            mean = seconds / calls * 1e6 if calls else 0.0
+            if nested:
+                share = f"{'nested':>7}"
+            else:
+                share = f"{seconds / wall * 100 if wall else 0.0:>6.1f}%"
+            lines.append(f"{name:<20} {calls:>9} {seconds * 1000:>11.2f} {mean:>10.1f} {share}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:<20} {value:>9}")
+        lines.append(f"{'wall clock':<20} {'':>9} {wall * 1000:>11.2f}")
+        return "\n".join(lines)
+
+    def finish(self) -> str:
+        """
+        Stop cProfile (writing its dump, if requested) and return the `report`.
+        """
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self._dump_path)
+            self._cprofile = None
+        return self.report()
+
+
+# Shared profiler used by `main.py` and `scripts/generate_chart.py`.
+PROFILER = Profiler()
@@ -1,27 +1,20 @@
 from rich.prompt import Prompt, InvalidResponse
 
+from .brl import EMPTY, INVALID_CHARACTERS, MULTIPLE_COMMAS, NOT_A_NUMBER, BRLParseError, parse_brl
+
 class FloatPromptBR(Prompt):
     response_type = float
     validate_error_message = "[bold orange_red1]:warning: Entrada Inválida![/bold orange_red1] [dim]Por favor, insira um valor numérico no formato BRL (ex: 1.500,00).[/dim]"
 
-    def process_response(self, value: str) -> float:
-        value = value.strip()
-        
-        if not value:
-            raise InvalidResponse("[bold orange_red1]  :no_entry_sign: valor não pode estar vazio.[/bold orange_red1]")
-
-        # Valid characters check
-        if any(c not in "0123456789.,-" for c in value):
-             raise InvalidResponse("[bold orange_red1]  :no_entry_sign: Caracteres inválidos detectados![/bold orange_red1] [yellow]Use apenas números, ponto e vírgula.[/yellow]")
+    error_messages = {
+        EMPTY: "[bold orange_red1]  :no_entry_sign: valor não pode estar vazio.[/bold orange_red1]",
+        INVALID_CHARACTERS: "[bold orange_red1]  :no_entry_sign: Caracteres inválidos detectados![/bold orange_red1] [yellow]Use apenas números, ponto e vírgula.[/yellow]",
+        MULTIPLE_COMMAS: "[bold orange_red1]  :1234: Formato incorreto![/bold orange_red1] [yellow]O número deve ter no máximo uma vírgula para decimais.[/yellow]",
+        NOT_A_NUMBER: "[bold orange_red1]  :warning: Não foi possível converter o valor.[/bold orange_red1] [yellow]Verifique o formato e tente novamente.[/yellow]",
+    }
 
-        # Check for multiple commas
-        if value.count(',') > 1:
-            raise InvalidResponse("[bold orange_red1]  :1234: Formato incorreto![/bold orange_red1] [yellow]O número deve ter no máximo uma vírgula para decimais.[/yellow]")
-
-        # Remove dots (thousands separators) and replace comma with dot (decimal separator)
-        cleaned_value = value.replace(".", "").replace(",", ".")
-        
+    def process_response(self, value: str) -> float:
         try:
-            return float(cleaned_value)
-        except ValueError:
-            raise InvalidResponse("[bold orange_red1]  :warning: Não foi possível converter o valor.[/bold orange_red1] [yellow]Verifique o formato e tente novamente.[/yellow]")
+            return parse_brl(value)
+        except BRLParseError as exc:
+            raise InvalidResponse(self.error_messages[exc.reason]) from None
@@ -0,0 +1,197 @@
+from rich import box
+from rich.table import Table
+
+from .brl import format_brl, format_brl_many
+from .profiling import PROFILER
+
+REPORT_TITLE = "[bold yellow]:bar_chart: Relatório de Custos[/bold yellow]"
+COMPONENTS_TITLE = "[bold yellow]:receipt: Custos por Componente[/bold yellow]"
+DEFAULT_PAGE_SIZE = 50
+COMPONENT_LABELS = {
+    "corretagem": "Corretagem",
+    "emolumentos": "Emolumentos",
+    "taxa_liquidacao": "Taxa de Liquidação",
+    "iss": "ISS",
+}
+# Column headers of the component table, short enough for an 80-column terminal.
+COMPONENT_HEADERS = {
+    "corretagem": "Corretagem",
+    "emolumentos": "Emolum.",
+    "taxa_liquidacao": "Liquidação",
+    "iss": "ISS",
+}
+
+
+def _styled_table(title: str) -> Table:
+    return Table(title=title,
+                 box=box.ROUNDED,
+                 show_lines=True,
+                 title_style="not italic",
+                 header_style="bold gold1",
+                 footer_style="bold gold1",
+                 border_style="violet"
+               )
+
+
+def build_table(title: str = REPORT_TITLE) -> Table:
+    """
+    Create an empty results table with the report styling.
+
+    Args:
+        title (str): Table title (Rich markup).
+
+    Returns:
+        Table: Table with the ticker, value, cost and final value columns.
+    """
+    table = _styled_table(title)
+    table.add_column(":label:  Nome/Ticker", style="bold cyan", no_wrap=True, justify="center")
+    table.add_column(":dollar: Valor Inicial", style="dodger_blue1", no_wrap=True, justify="center",)
+    table.add_column(":chart_with_downwards_trend: Custo (+)", style="red", no_wrap=True, justify="center")
+    table.add_column(":moneybag: Valor Final (=)", style="bold spring_green1", no_wrap=True, justify="center")
+    return table
+
+
+def build_component_table(title: str = COMPONENTS_TITLE, components: tuple = ()) -> Table:
+    """
+    Create an empty table for the per-component cost breakdown.
+
+    The breakdown is kept out of the main table so the cost and final value
+    are never squeezed out by up to four extra columns. Component amounts
+    fold instead of being cut when the terminal is too narrow.
+
+    Args:
+        title (str): Table title (Rich markup).
+        components (tuple): Cost component names, one column each.
+
+    Returns:
+        Table: Table with the ticker and one column per component.
+    """
+    table = _styled_table(title)
+    table.add_column(":label:  Nome/Ticker", style="bold cyan", no_wrap=True, justify="center")
+    for name in components:
+        label = COMPONENT_HEADERS.get(name) or name.replace("_", " ").title()
+        table.add_column(label, style="light_coral", overflow="fold", justify="center")
+    return table
+
+
+def _build_tables(page_title: str, components: tuple) -> list:
+    tables = [build_table(REPORT_TITLE + page_title)]
+    if components:
+        tables.append(build_component_table(COMPONENTS_TITLE + page_title, components))
+    return tables
+
+
+class ReportTotals:
+    """Running sums of a report, filled in while its rows are rendered."""
+
+    def __init__(self, component_count: int = 0):
+        self.rows = 0
+        self.value = 0.0
+        self.cost = 0.0
+        self.value_cost = 0.0
+        self.components = [0.0] * component_count
+
+    def add_page(self, values: list, costs: list, value_costs: list, components: list = ()) -> None:
+        self.rows += len(values)
+        self.value += sum(values)
+        self.cost += sum(costs)
+        self.value_cost += sum(value_costs)
+        for position, column in enumerate(components):
+            self.components[position] += sum(column)
+
+    def residual(self, total_grade: float) -> float:
+        """
+        Cost left over by per-asset rounding.
+
+        Args:
+            total_grade (float): Total value of the note, costs included.
+
+        Returns:
+            float: ``total_grade - total value - sum of the costs``, rounded to
+                   cents; always ``0.0`` in ``'cents'`` mode.
+        """
+        return round(total_grade - self.value - self.cost, 2) + 0.0
+
+
+def _add_page(tables: list, page: list, totals: ReportTotals) -> None:
+    tickers, values, costs, value_costs, *components = zip(*page)
+    # Display order: value, total cost, final value, then one column per component.
+    numeric = [values, costs, value_costs, *components]
+    with PROFILER.stage("format_brl"):
+        # One batched call per page instead of one call per cell.
+        formatted = format_brl_many([amount for column in numeric for amount in column])
+    totals.add_page(values, costs, value_costs, components)
+    size = len(page)
+    with PROFILER.stage("table"):
+        for index, ticker in enumerate(tickers):
+            cells = formatted[index::size]
+            tables[0].add_row(ticker, *cells[:3])
+            if components:
+                tables[1].add_row(ticker, *cells[3:])
+
+
+def print_report(console, rows, total_grade: float = None, page_size: int = DEFAULT_PAGE_SIZE,
+                 components: tuple = ()) -> ReportTotals:
+    """
+    Print the result rows as a table, one page of ``page_size`` rows at a time.
+
+    Each page is laid out and printed as soon as its rows are read, so the
+    first page shows up immediately and the layout cost is bounded by the page
+    size, however many rows there are. The totals are summed in the same pass
+    and shown as a footer on the last page, with the rounding residual when
+    ``total_grade`` is given. With ``components``, each page also gets a
+    second table with the cost of each component.
+
+    Args:
+        console: Rich console to print to.
+        rows: Iterable of ``(ticker, value, cost, value_cost)`` tuples, such as
+            `Allocation.rows()`; it may be a lazy generator. With
+            ``components``, each row also ends with the component costs, as
+            in `Allocation.breakdown_rows()`.
+        total_grade (float, optional): Total value of the note, to report the
+            rounding residual.
+        page_size (int): Rows per page; ``0`` prints a single table.
+        components (tuple): Names of the cost components in the rows.
+
+    Returns:
+        ReportTotals: The sums of the printed rows.
+    """
+    components = tuple(components)
+    totals = ReportTotals(len(components))
+    page_number = 1
+    tables = _build_tables("", components)
+    page = []
+    for row in rows:
+        # A full page is printed once the next row arrives, so the footer
+        # always lands on a page with rows.
+        if page_size and len(page) == page_size:
+            _add_page(tables, page, totals)
+            page = []
+            with PROFILER.stage("render"):
+                for table in tables:
+                    console.print("\n", table)
+            page_number += 1
+            tables = _build_tables(f" [dim](página {page_number})[/dim]", components)
+        page.append(row)
+    if page:
+        _add_page(tables, page, totals)
+
+    footers = (
+        (
+            f"Total ({totals.rows} ativos)",
+            format_brl(totals.value),
+            format_brl(totals.cost),
+            format_brl(totals.value_cost),
+        ),
+        ("Total", *(format_brl(amount) for amount in totals.components)),
+    )
+    for table, table_footers in zip(tables, footers):
+        table.show_footer = True
+        for column, footer in zip(table.columns, table_footers):
+            column.footer = footer
+    if total_grade is not None:
+        tables[0].caption = f"Resíduo de arredondamento: {format_brl(totals.residual(total_grade))}"
+    with PROFILER.stage("render"):
+        for table in tables:
+            console.print("\n", table)
+    return totals
@@ -0,0 +1,299 @@
+import asyncio
+import json
+import math
+import time
+from collections import Counter, deque
+
+from .calcula import MODES, calculate, merge_duplicates
+from .profiling import PROFILER
+from .streams import NOTE_ERRORS, note_from_record
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+# Errors answered with 400: invalid notes, and amounts too large to calculate.
+REQUEST_ERRORS = NOTE_ERRORS + (ArithmeticError,)
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error",
+}
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    Args:
+        ordered (list): Sorted samples.
+        fraction (float): Percentile between 0 and 1, e.g. ``0.99``.
+
+    Returns:
+        float: The sample at that rank, or 0.0 when there are no samples.
+    """
+    if not ordered:
+        return 0.0
+    rank = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class ServiceMetrics:
+    """Request latencies (last ``window`` requests) and batch-size counts."""
+
+    def __init__(self, window: int = 10_000):
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = Counter()
+        self.requests = 0
+        self.errors = 0
+
+    def record_request(self, seconds: float, ok: bool) -> None:
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+        self.latencies.append(seconds)
+
+    def record_batch(self, size: int) -> None:
+        self.batch_sizes[size] += 1
+
+    def snapshot(self) -> dict:
+        """
+        Summarize the metrics as a JSON-serializable dict.
+
+        Returns:
+            dict: Request and error counts, latency percentiles in milliseconds
+                  (``p50``, ``p90``, ``p99``, ``max``) and batch statistics
+                  (count, mean and max size, and a size histogram).
+        """
+        ordered = sorted(self.latencies)
+        batches = sum(self.batch_sizes.values())
+        notes = sum(size * count for size, count in self.batch_sizes.items())
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_ms": {
+                "samples": len(ordered),
+                "p50": round(percentile(ordered, 0.50) * 1000, 3),
+                "p90": round(percentile(ordered, 0.90) * 1000, 3),
+                "p99": round(percentile(ordered, 0.99) * 1000, 3),
+                "max": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+            },
+            "batches": {
+                "count": batches,
+                "mean_size": round(notes / batches, 2) if batches else 0.0,
+                "max_size": max(self.batch_sizes, default=0),
+                "sizes": {str(size): count for size, count in sorted(self.batch_sizes.items())},
+            },
+        }
+
+
+class MicroBatcher:
+    """
+    Groups notes submitted within a short window into one computation.
+
+    The first note of a batch starts a timer of ``window`` seconds; every note
+    submitted before it fires (or until ``max_batch`` notes are waiting) is
+    calculated together. In ``'float'`` mode with NumPy installed, the whole
+    batch is a single `calculate_batch` call; otherwise each note goes through
+    `calculate`. Invalid notes only fail their own request.
+    """
+
+    def __init__(self, mode: str = "float", window: float = 0.002, max_batch: int = 256,
+                 metrics: ServiceMetrics = None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown calculation mode: {mode!r}. Use one of {MODES}.")
+        self.mode = mode
+        self.window = window
+        self.max_batch = max_batch
+        self.metrics = metrics or ServiceMetrics()
+        self._pending = []
+        self._timer = None
+        self._calculate_batch = None
+        if mode == "float":
+            try:
+                from .batch import calculate_batch
+            except ImportError:
+                pass
+            else:
+                self._calculate_batch = calculate_batch
+
+    def submit(self, record: dict) -> asyncio.Future:
+        """
+        Queue a note in the `data/demo_data.json` schema for the next batch.
+
+        Returns:
+            asyncio.Future: Resolves to the `calculate` dict of the note, or
+            raises the ``ValueError`` (or ``KeyError``/``TypeError``) of an
+            invalid note.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((record, future))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+        return future
+
+    def flush(self) -> None:
+        """Calculate every pending note now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        self.metrics.record_batch(len(pending))
+
+        notes = []
+        for record, future in pending:
+            if future.done():  # the request was cancelled while waiting
+                continue
+            try:
+                tickers, values, total_grade = note_from_record(record)
+                tickers, values = merge_duplicates(tickers, values)
+                if sum(values) == 0:
+                    raise ValueError("Total value of inputs cannot be zero.")
+            except NOTE_ERRORS as exc:
+                future.set_exception(exc)
+                continue
+            notes.append((future, tickers, values, total_grade))
+
+        with PROFILER.stage("calculate"):
+            if self._calculate_batch is not None:
+                try:
+                    self._flush_vectorized(notes)
+                    return
+                except Exception:
+                    pass  # fall back to one note at a time, so each note gets its own error
+            for future, tickers, values, total_grade in notes:
+                if future.done():
+                    continue
+                try:
+                    result = calculate(tickers, values, total_grade, mode=self.mode)
+                except Exception as exc:  # an unresolved future would hang its request
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+
+    def _flush_vectorized(self, notes: list) -> None:
+        note_ids = []
+        values = []
+        for position, (_, _, note_values, _) in enumerate(notes):
+            note_ids.extend([position] * len(note_values))
+            values.extend(note_values)
+        out = self._calculate_batch(note_ids, values, [note[3] for note in notes])
+        # One shared row iterator: each note consumes exactly its own rows.
+        columns = zip(out['value'].tolist(), out['cost'].tolist(), out['value_cost'].tolist())
+        for future, tickers, _, _ in notes:
+            result = {}
+            for ticker, (value, cost, value_cost) in zip(tickers, columns):
+                result[ticker] = {'value': value, 'value_cost': value_cost, 'cost': cost}
+            if not future.done():
+                future.set_result(result)
+
+
+class CalculationService:
+    """
+    Minimal HTTP/1.1 server (asyncio streams only) around `MicroBatcher`.
+
+    Endpoints:
+        ``POST /calculate``: body is one note in the `data/demo_data.json`
+        schema; answers with the `calculate` dict as JSON, or ``400`` with
+        ``{"error": ...}`` for an invalid note (``500`` for any other error).
+        ``GET /metrics``: the `ServiceMetrics.snapshot` of the server.
+
+    Connections are kept alive between requests unless the client asks to
+    close them.
+
+    Example:
+        >>> service = CalculationService(port=8080)
+        >>> asyncio.run(service.serve_forever())
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080, mode: str = "float",
+                 window: float = 0.002, max_batch: int = 256):
+        self.host = host
+        self.port = port
+        self.metrics = ServiceMetrics()
+        self.batcher = MicroBatcher(mode, window, max_batch, self.metrics)
+        self._server = None
+
+    async def start(self) -> None:
+        """Start listening; with ``port=0`` the chosen port is stored in ``self.port``."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop accepting connections and wait for the server to close."""
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, version = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "Request body too large."}, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version.strip() == "HTTP/1.1"
+                status, payload = await self._dispatch(method, path.split("?", 1)[0], body)
+                await self._respond(writer, status, payload, close=not keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> tuple:
+        if path == "/metrics":
+            if method != "GET":
+                return 405, {"error": "Use GET."}
+            return 200, self.metrics.snapshot()
+        if path != "/calculate":
+            return 404, {"error": f"Unknown path {path}."}
+        if method != "POST":
+            return 405, {"error": "Use POST."}
+
+        start = time.perf_counter()
+        try:
+            record = json.loads(body)
+            if not isinstance(record, dict):
+                raise ValueError("Expected a JSON object with 'items' and 'custo_total'.")
+            result = await self.batcher.submit(record)
+        except REQUEST_ERRORS as exc:
+            self.metrics.record_request(time.perf_counter() - start, ok=False)
+            return 400, {"error": str(exc)}
+        except Exception as exc:  # `flush` passes any calculation error to the future
+            self.metrics.record_request(time.perf_counter() - start, ok=False)
+            return 500, {"error": str(exc) or type(exc).__name__}
+        self.metrics.record_request(time.perf_counter() - start, ok=True)
+        return 200, result
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload, close: bool) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
@@ -0,0 +1,274 @@
+import csv
+import json
+import math
+import os
+
+from .calcula import calculate, calculate_components
+
+NOTE_ERRORS = (KeyError, TypeError, ValueError)
+RESULT_FIELDS = ("nota", "ticker", "value", "cost", "value_cost")
+CSV_FIELDS = ("nota", "ticker", "valor")
+
+
+def note_from_record(record: dict) -> tuple:
+    """
+    Convert a note in the `data/demo_data.json` schema into `calculate` arguments.
+
+    Args:
+        record (dict): Note with ``items`` (list of dicts with ``ticker`` and
+            ``valor``) and ``custo_total`` (total cost of the note). The cost
+            may instead be split by component in ``custos`` (see
+            `note_components`), in which case ``custo_total`` is optional.
+            The readers pass an exception instead of a dict for a note they
+            could not read; it is raised here, so it is reported like any
+            other invalid note.
+
+    Returns:
+        tuple: ``(ticket_names, values, total_grade)`` where ``total_grade`` is
+               the sum of the values plus the note cost.
+
+    Raises:
+        ValueError: If the note has no items, an amount that is not finite
+            (``NaN`` or ``Infinity``), or could not be read.
+        TypeError: If the note is not a mapping.
+    """
+    if isinstance(record, Exception):
+        raise record
+    if not isinstance(record, dict):
+        raise TypeError(f"Note must be an object, not {type(record).__name__}.")
+    items = record.get("items") or []
+    if not items:
+        raise ValueError("Note has no items.")
+    ticket_names = [str(item["ticker"]).strip().upper() for item in items]
+    values = [float(item["valor"]) for item in items]
+    components = note_components(record)
+    if components is not None:
+        total_grade = sum(values) + sum(components.values())
+    else:
+        total_grade = sum(values) + float(record.get("custo_total") or 0)
+    if not math.isfinite(total_grade):
+        raise ValueError("Note amounts must be finite numbers.")
+    return ticket_names, values, total_grade
+
+
+def note_components(record: dict):
+    """
+    Read the per-component costs of a note, if it has them.
+
+    Args:
+        record (dict): Note that may carry ``custos``, a mapping of component
+            name to amount, e.g. ``{"corretagem": 10, "emolumentos": 0.35}``.
+
+    Returns:
+        dict: Component amounts as floats, or None when the note has no ``custos``.
+    """
+    components = record.get("custos")
+    if not components:
+        return None
+    if not isinstance(components, dict):
+        raise TypeError("custos must map component names to amounts.")
+    return {str(name): float(amount) for name, amount in components.items()}
+
+
+def note_quantities(record: dict):
+    """
+    Read the quantity bought of each ticker of a note, if it has them.
+
+    Quantities are optional per item (``quantidade``); a ticker repeated in the
+    note gets the sum of its quantities, as its values are summed by
+    `merge_duplicates`.
+
+    Args:
+        record (dict): Note whose ``items`` may carry ``quantidade``.
+
+    Returns:
+        dict: Ticker to quantity, or None when no item has a quantity.
+
+    Raises:
+        ValueError: If a quantity is not a finite number.
+    """
+    quantities = {}
+    for item in record.get("items") or []:
+        quantity = item.get("quantidade")
+        if quantity is None or quantity == "":
+            continue
+        quantity = float(quantity)
+        if not math.isfinite(quantity):
+            raise ValueError("quantidade must be a finite number.")
+        ticker = str(item["ticker"]).strip().upper()
+        quantities[ticker] = quantities.get(ticker, 0.0) + quantity
+    return quantities or None
+
+
+def read_jsonl_notes(handle):
+    """
+    Lazily read notes from a JSON Lines stream, one note per line.
+
+    Blank lines are ignored. A note may carry its own id in a ``nota`` field;
+    otherwise its 1-based line position is used.
+
+    Args:
+        handle: Text stream to read from.
+
+    Yields:
+        tuple: ``(note_id, record)`` for each note in the stream. A line that
+               is not valid JSON gives a ``ValueError`` as its record, so one
+               bad line is reported as an invalid note instead of ending the
+               stream (see `note_from_record`).
+    """
+    position = 0
+    for line in handle:
+        if not line.strip():
+            continue
+        position += 1
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield position, ValueError(f"Invalid JSON: {exc}")
+            continue
+        if isinstance(record, dict):
+            yield record.get("nota", position), record
+        else:
+            yield position, record
+
+
+def read_csv_notes(handle):
+    """
+    Lazily read notes from a CSV stream with one asset per row.
+
+    Expected columns are ``nota``, ``ticker``, ``valor`` and ``custo_total``,
+    plus an optional ``quantidade`` (see `note_quantities`).
+    Consecutive rows sharing the same ``nota`` form one note, and the note cost
+    is taken from its first row, so only one note is held in memory at a time.
+
+    Args:
+        handle: Text stream to read from.
+
+    Yields:
+        tuple: ``(note_id, record)`` with ``record`` in the `demo_data.json`
+               schema. A file without the required columns yields a single
+               ``ValueError`` record instead.
+    """
+    reader = csv.DictReader(handle)
+    missing = [field for field in CSV_FIELDS if field not in (reader.fieldnames or ())]
+    if missing:
+        yield 1, ValueError(f"CSV is missing the columns: {', '.join(missing)}.")
+        return
+    current_id = None
+    record = None
+    for row in reader:
+        note_id = row["nota"]
+        if note_id != current_id:
+            if record is not None:
+                yield current_id, record
+            current_id = note_id
+            record = {"custo_total": row.get("custo_total") or 0, "items": []}
+        item = {"ticker": row["ticker"], "valor": row["valor"]}
+        if row.get("quantidade"):
+            item["quantidade"] = row["quantidade"]
+        record["items"].append(item)
+    if record is not None:
+        yield current_id, record
+
+
+def calculate_notes(notes, mode: str = "float"):
+    """
+    Run `calculate` over ``(note_id, record)`` pairs, one note at a time.
+
+    Args:
+        notes: Iterable of ``(note_id, record)`` pairs in the `demo_data.json` schema.
+        mode (str): Calculation mode passed to `calculate`.
+
+    Yields:
+        tuple: ``(note_id, result, error)`` where exactly one of ``result``
+               (the `calculate` dict, or a `calculate_components` result for
+               notes with ``custos``) and ``error`` (a message) is set.
+    """
+    for note_id, record in notes:
+        try:
+            ticket_names, values, total_grade = note_from_record(record)
+            components = note_components(record)
+            if components is None:
+                result = calculate(ticket_names, values, total_grade, mode=mode)
+            else:
+                result = calculate_components(ticket_names, values, components, mode=mode)
+        except NOTE_ERRORS as exc:
+            yield note_id, None, str(exc)
+            continue
+        yield note_id, result, None
+
+
+def iter_result_rows(note_id, result: dict):
+    """
+    Flatten a `calculate` result into output rows.
+
+    Args:
+        note_id: Identifier of the note the result belongs to.
+        result (dict): Mapping of ticker to ``value``, ``value_cost`` and ``cost``.
+
+    Yields:
+        dict: One row per ticker with the keys in `RESULT_FIELDS`, plus
+              ``custos`` (the cost of each component) when the result has a
+              per-component breakdown.
+    """
+    for ticker, data in result.items():
+        row = {
+            "nota": note_id,
+            "ticker": ticker,
+            "value": data["value"],
+            "cost": data["cost"],
+            "value_cost": data["value_cost"],
+        }
+        if "costs" in data:
+            row["custos"] = data["costs"]
+        yield row
+
+
+class CSVRowWriter:
+    """
+    Writes result rows as CSV, emitting the header before the first row.
+
+    When appending to a file that already has content, the header is skipped.
+    Keys outside ``fieldnames`` (such as the ``custos`` breakdown) are left out.
+    """
+
+    def __init__(self, handle, fieldnames: tuple = RESULT_FIELDS):
+        self._writer = csv.DictWriter(handle, fieldnames=fieldnames, extrasaction="ignore")
+        if not (handle.seekable() and handle.tell() > 0):
+            self._writer.writeheader()
+
+    def write(self, row: dict) -> None:
+        self._writer.writerow(row)
+
+
+class JSONLRowWriter:
+    """Writes result rows as JSON Lines, one object per row."""
+
+    def __init__(self, handle, fieldnames: tuple = RESULT_FIELDS):
+        self._handle = handle
+
+    def write(self, row: dict) -> None:
+        self._handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+READERS = {"jsonl": read_jsonl_notes, "csv": read_csv_notes}
+WRITERS = {"jsonl": JSONLRowWriter, "csv": CSVRowWriter}
+
+
+def detect_format(path: str, default: str = "jsonl") -> str:
+    """
+    Guess the stream format from a file name.
+
+    Args:
+        path (str): File path, or ``-`` for stdin/stdout.
+        default (str): Format used when the suffix is not recognized.
+
+    Returns:
+        str: ``'csv'`` or ``'jsonl'``.
+    """
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return default
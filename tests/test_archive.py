@@ -0,0 +1,57 @@
+import os
+import struct
+import tempfile
+import unittest
+
+from src.utils.archive import ArchiveReader, write_archive
+from src.utils.calcula import calculate, calculate_compact
+
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "notes.cda")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_by_note_and_by_ticker(self):
+        notes = [
+            ("n1", calculate(["PETR4", "VALE3"], [1500.0, 2500.0], 4010.0)),
+            ("n2", calculate_compact(["VALE3", "ITUB4", "PETR4"], [100.0, 200.0, 300.0], 607.0, mode="cents")),
+            (3, calculate(["ITUB4"], [50.0], 51.0)),
+        ]
+        self.assertEqual(write_archive(self.path, notes), (3, 6, 3))
+
+        with ArchiveReader(self.path) as archive:
+            self.assertEqual(len(archive), 3)
+            self.assertEqual(archive.tickers(), ["ITUB4", "PETR4", "VALE3"])
+            for index, (note_id, result) in enumerate(notes):
+                self.assertEqual(archive.note_id(index), str(note_id))
+                self.assertEqual(
+                    archive.note(index),
+                    [(ticker, data['value'], data['cost'], data['value_cost']) for ticker, data in result.items()],
+                )
+            self.assertEqual(
+                archive.ticker("PETR4"),
+                [(0, 1500.0, 3.75, 1503.75), (1, 300.0, 3.5, 303.5)],
+            )
+            with self.assertRaises(KeyError):
+                archive.ticker("BBAS3")
+            with self.assertRaises(IndexError):
+                archive.note(3)
+
+    def test_columns_are_aligned_and_rejects_other_files(self):
+        write_archive(self.path, [("n1", calculate(["AAA"], [10.0], 11.0))])
+        with ArchiveReader(self.path) as archive:
+            self.assertEqual(list(archive.costs), [1.0])
+            self.assertTrue(all(offset % 8 == 0 for offset in archive._offsets.values()))
+
+        with open(self.path, "r+b") as handle:
+            handle.write(struct.pack("<8s", b"NOTANOTE"))
+        with self.assertRaises(ValueError):
+            ArchiveReader(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import random
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency of the batch engine
+    np = None
+
+from src.utils.calcula import calculate, calculate_components, sequential_sum
+
+if np is not None:
+    from src.utils.batch import calculate_batch, calculate_batch_components, round_cents
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestCalculateBatch(unittest.TestCase):
+    def test_matches_scalar_calculate_to_the_cent(self):
+        """Every row of the batch result must match `calculate` for its note."""
+        rng = random.Random(7)
+        notes = []
+        for _ in range(200):
+            size = rng.randint(1, 12)
+            tickers = [f"T{i}" for i in range(size)]
+            # Sub-cent values too: they are where np.round and round() disagree.
+            values = [round(rng.uniform(1, 5_000), rng.choice((2, 3, 6))) for _ in tickers]
+            notes.append((tickers, values, round(sum(values) + rng.uniform(-5, 80), 3)))
+
+        note_ids = [i for i, note in enumerate(notes) for _ in note[1]]
+        values = [v for note in notes for v in note[1]]
+        result = calculate_batch(note_ids, values, [note[2] for note in notes])
+
+        row = 0
+        for note in notes:
+            for data in calculate(*note).values():
+                for key in ("value", "cost", "value_cost"):
+                    self.assertEqual(result[key][row], data[key])
+                row += 1
+
+    def test_round_cents_matches_round(self):
+        values = np.array([33.085, 22.735, 45.159, 1.005, 0.285, -2.675, 1e9 + 0.125])
+        self.assertEqual(round_cents(values).tolist(), [round(value, 2) for value in values.tolist()])
+
+    def test_note_totals_match_sequential_sum(self):
+        """Both engines must add a note's values the same way, on any Python version."""
+        self.assertEqual(sequential_sum([0.1] * 10), 0.9999999999999999)
+        rng = random.Random(3)
+        values = [rng.uniform(0.01, 1e9) for _ in range(5000)]
+        note_ids = np.zeros(len(values), dtype=np.intp)
+        self.assertEqual(np.bincount(note_ids, weights=values)[0], sequential_sum(values))
+        expected = calculate([f"T{i}" for i in range(10)], [0.1] * 10, 1.05)
+        result = calculate_batch([0] * 10, [0.1] * 10, [1.05])
+        self.assertEqual(result["cost"].tolist(), [data["cost"] for data in expected.values()])
+
+    def test_rows_do_not_need_to_be_grouped(self):
+        """Rows of different notes may be interleaved."""
+        result = calculate_batch([1, 0, 1, 0], [50.0, 100.0, 50.0, 200.0], [350.0, 110.0])
+        self.assertEqual(result["cost"].tolist(), [5.0, 16.67, 5.0, 33.33])
+
+    def test_zero_total_note_raises(self):
+        with self.assertRaises(ValueError):
+            calculate_batch([0, 1], [10.0, 0.0], [11.0, 1.0])
+
+    def test_components_match_calculate_components(self):
+        result = calculate_batch_components([0, 0, 1], [100.0, 300.0, 50.0], [[4.0, 0.35], [1.0, 0.1]])
+
+        expected = [
+            calculate_components(["A", "B"], [100.0, 300.0], {"c": 4.0, "e": 0.35}),
+            calculate_components(["C"], [50.0], {"c": 1.0, "e": 0.1}),
+        ]
+        rows = [row for allocation in expected for row in allocation.breakdown_rows()]
+        self.assertEqual(result["cost"].tolist(), [row[2] for row in rows])
+        self.assertEqual(result["components"].tolist(), [list(row[4:]) for row in rows])
@@ -0,0 +1,54 @@
+import unittest
+
+from src.utils.brl import (
+    EMPTY,
+    INVALID_CHARACTERS,
+    MULTIPLE_COMMAS,
+    NOT_A_NUMBER,
+    BRLParseError,
+    format_brl,
+    format_brl_many,
+    format_brl_no_decimals,
+    parse_brl,
+    _memoized,
+    parse_brl_many,
+)
+
+
+class TestBRLCodec(unittest.TestCase):
+    """Tests for the shared BRL formatting and parsing core."""
+    def test_format_single_and_many(self):
+        self.assertEqual(format_brl(-1234567.891), "R$ -1.234.567,89")
+        self.assertEqual(format_brl_no_decimals(1250.75), "R$ 1.251")
+        expected = ["R$ 0,50", "R$ 1.000,00", "R$ 0,50"]
+        self.assertEqual(format_brl_many([0.5, 1000, 0.5]), expected)
+        self.assertEqual(format_brl_many([0.5, 1000, 0.5], cache_size=2), expected)
+
+    def test_parse_accepts_brl_input_formats(self):
+        self.assertEqual(parse_brl_many(["1500", " 1500,00 ", "1.500,00", "-0,5"]), [1500.0, 1500.0, 1500.0, -0.5])
+        self.assertEqual(parse_brl_many(["1,5", "1,5"], cache_size=8), [1.5, 1.5])
+
+    def test_cache_is_reused_across_calls(self):
+        parse_brl_many(["7,25"], cache_size=16)
+        parse_brl_many(["7,25"], cache_size=16)
+        self.assertGreaterEqual(_memoized(parse_brl, 16).cache_info().hits, 1)
+
+    def test_cached_format_keeps_signed_zeros(self):
+        for values in ([-0.0, 0.0], [0.0, -0.0], [0, -0.0, 0.0]):
+            with self.subTest(values=values):
+                self.assertEqual(format_brl_many(values, cache_size=16), format_brl_many(values))
+
+    def test_parse_many_rejects_embedded_newlines(self):
+        for texts in (["1\n2"], ["1", "2\n3"]):
+            with self.subTest(texts=texts):
+                with self.assertRaises(BRLParseError) as ctx:
+                    parse_brl_many(texts)
+                self.assertEqual(ctx.exception.reason, INVALID_CHARACTERS)
+
+    def test_parse_reports_reason(self):
+        cases = {"": EMPTY, "R$ 10": INVALID_CHARACTERS, "1,0,0": MULTIPLE_COMMAS, "1-2": NOT_A_NUMBER}
+        for text, reason in cases.items():
+            with self.subTest(text=text):
+                with self.assertRaises(BRLParseError) as ctx:
+                    parse_brl(text)
+                self.assertEqual(ctx.exception.reason, reason)
@@ -1,6 +1,6 @@
 import unittest
 
-from src.utils.calcula import calculate
+from src.utils.calcula import allocate_cents, calculate, calculate_compact, calculate_components
 from src.utils.formatters import format_brl
 
 
@@ -40,6 +40,92 @@ class TestCalculate(unittest.TestCase):
         }
         self.assertEqual(result, expected)
 
+    def test_cents_mode_costs_add_up_to_note_cost(self):
+        """
+        Test the integer-cents mode with a cost that does not split evenly.
+
+        Scenario:
+        - Three assets of 100.0 each and a total grade of 301.0
+        - Cost to distribute: 1.00, i.e. 33.33... cents per asset
+
+        The float mode rounds each share to 0.33 and loses a cent; the cents
+        mode floors every share to 33 cents and gives the leftover cent to the
+        first asset (all remainders tie), so the costs add up to exactly 1.00.
+        """
+        result = calculate(["AAA", "BBB", "CCC"], [100.0, 100.0, 100.0], 301.0, mode="cents")
+
+        self.assertEqual([data['cost'] for data in result.values()], [0.34, 0.33, 0.33])
+        self.assertEqual(result["AAA"]['value_cost'], 100.34)
+
+    def test_cents_mode_allocates_to_largest_remainders(self):
+        values = [1500.0, 2500.0, 3000.0, 1000.0, 0.01]
+        result = calculate(["A", "B", "C", "D", "E"], values, 8250.37, mode="cents")
+
+        costs = [round(data['cost'] * 100) for data in result.values()]
+        self.assertEqual(sum(costs), 25036)
+        self.assertEqual(costs, [4694, 7824, 9388, 3130, 0])
+
+    def test_allocate_cents_many_leftover_units(self):
+        """Large leftovers take the sort path; ties still go to the earliest positions."""
+        self.assertEqual(allocate_cents([1] * 10, 7), [1] * 7 + [0] * 3)
+        self.assertEqual(allocate_cents([3, 1, 3, 1, 3], 4), [1, 1, 1, 0, 1])
+        self.assertEqual(allocate_cents([2, 1, 2, 1, 2, 1], -5), [-1, -1, -1, -1, -1, 0])
+
+    def test_cents_mode_handles_negative_cost(self):
+        result = calculate(["AAA", "BBB"], [100.0, 200.0], 299.0, mode="cents")
+        self.assertEqual([data['cost'] for data in result.values()], [-0.33, -0.67])
+
+    def test_unknown_mode_raises(self):
+        with self.assertRaises(ValueError):
+            calculate(["AAA"], [1.0], 1.0, mode="decimal")
+
+    def test_repeated_ticker_is_merged_not_overwritten(self):
+        for mode in ("float", "cents"):
+            with self.subTest(mode=mode):
+                result = calculate(["AAA", "BBB", "AAA"], [100.0, 200.0, 100.0], 404.0, mode=mode)
+                self.assertEqual(list(result), ["AAA", "BBB"])
+                self.assertEqual(result["AAA"], {'value': 200.0, 'value_cost': 202.0, 'cost': 2.0})
+
+
+class TestCalculateCompact(unittest.TestCase):
+    """Tests for the column-oriented Allocation result."""
+    def test_matches_calculate_in_both_modes(self):
+        ticket_names = ["AAA", "BBB", "CCC", "AAA"]
+        values = [100.0, 200.0, 0.5, 50.0]
+        for mode in ("float", "cents"):
+            with self.subTest(mode=mode):
+                result = calculate_compact(ticket_names, values, 400.0, mode=mode)
+                expected = calculate(ticket_names, values, 400.0, mode=mode)
+
+                self.assertEqual(result.to_dict(), expected)
+                self.assertEqual(list(result), list(expected))
+                self.assertEqual(result["BBB"], expected["BBB"])
+
+    def test_rows_follow_input_lines(self):
+        result = calculate_compact(["AAA", "BBB"], [100.0, 200.0], 350.0)
+        self.assertEqual(list(result.rows()), [("AAA", 100.0, 16.67, 116.67), ("BBB", 200.0, 33.33, 233.33)])
+
+
+class TestCalculateComponents(unittest.TestCase):
+    """Tests for the per-component cost allocation."""
+    def test_components_add_up_to_the_cost_of_each_asset(self):
+        components = {"corretagem": 4.0, "emolumentos": 0.35, "iss": 0.4}
+        result = calculate_components(["AAA", "BBB"], [100.0, 300.0], components)
+
+        self.assertEqual(result["BBB"]["costs"], {"corretagem": 3.0, "emolumentos": 0.26, "iss": 0.3})
+        self.assertEqual(result["BBB"]["cost"], 3.56)
+        self.assertEqual(list(result.breakdown_rows())[0], ("AAA", 100.0, 1.19, 101.19, 1.0, 0.09, 0.1))
+        single = calculate(["AAA", "BBB"], [100.0, 300.0], 404.0)
+        self.assertEqual(calculate_components(["AAA", "BBB"], [100.0, 300.0], {"corretagem": 4.0}).to_dict(),
+                         {ticker: {**data, "costs": {"corretagem": data["cost"]}} for ticker, data in single.items()})
+
+    def test_cents_mode_is_exact_per_component(self):
+        components = {"corretagem": 1.0, "iss": 0.1}
+        result = calculate_components(["A", "B", "C"], [1.0, 1.0, 1.0], components, mode="cents")
+        for name, amount in components.items():
+            self.assertAlmostEqual(sum(result.components[name]), amount)
+        self.assertAlmostEqual(sum(result.costs), 1.1)
+
 
 class TestFormatters(unittest.TestCase):
     """Tests for BRL currency formatting helpers."""
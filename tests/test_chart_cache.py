@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from chart_cache import RenderCache, cache_key, source_version
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_depends_on_content_not_key_order(self):
+        data = {"custo_total": 1, "items": [{"ticker": "A", "valor": 1}]}
+        same = {"items": [{"valor": 1, "ticker": "A"}], "custo_total": 1}
+
+        self.assertEqual(cache_key(data, "svg", "v1", width=10, height=5),
+                         cache_key(same, "svg", "v1", height=5, width=10))
+        self.assertNotEqual(cache_key(data, "svg", "v1", width=10, height=5),
+                            cache_key(data, "svg", "v1", width=11, height=5))
+
+    def test_key_depends_on_backend_and_renderer_code(self):
+        data = {"custo_total": 1, "items": [{"ticker": "A", "valor": 1}]}
+        source = self.root / "renderer.py"
+        source.write_text("WIDTH = 1\n")
+        before = source_version(str(source))
+        source.write_text("WIDTH = 2\n")
+        source_version.cache_clear()
+
+        self.assertNotEqual(source_version(str(source)), before)
+        self.assertNotEqual(cache_key(data, "svg", before), cache_key(data, "plotly", before))
+        self.assertNotEqual(cache_key(data, "svg", before), cache_key(data, "svg", source_version(str(source))))
+
+    def test_fetch_after_store_copies_the_render(self):
+        cache = RenderCache(self.root / "cache")
+        rendered = self.root / "chart.svg"
+        rendered.write_text("<svg/>")
+        output = self.root / "out" / "copy.svg"
+
+        self.assertFalse(cache.fetch("k", output))
+        cache.store("k", rendered)
+        self.assertTrue(cache.fetch("k", output))
+        self.assertEqual(output.read_text(), "<svg/>")
+
+    def test_evicts_least_recently_used_entries_over_the_limit(self):
+        cache = RenderCache(self.root / "cache", max_bytes=10)
+        rendered = self.root / "chart.svg"
+        rendered.write_text("12345")
+        for age, key in enumerate(("old", "mid")):
+            cache.store(key, rendered)
+            os.utime(cache.directory / f"{key}.svg", (age, age))
+        cache.store("new", rendered)
+
+        self.assertEqual(sorted(path.stem for path in cache.directory.glob("*.svg")), ["mid", "new"])
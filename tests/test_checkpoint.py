@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+from src.utils.checkpoint import Checkpoint, DigestSet, note_fingerprint
+from src.utils.streams import calculate_notes
+
+
+def make_notes(costs):
+    return [
+        (i, {"custo_total": cost, "items": [{"ticker": "AAA", "valor": 100}, {"ticker": "BBB", "valor": 200}]})
+        for i, cost in enumerate(costs)
+    ]
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "run.digests")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fingerprint_changes_with_any_input(self):
+        base = note_fingerprint(1, ["AAA"], [10.0], 11.0)
+        self.assertEqual(base, note_fingerprint(1, ["AAA"], [10], 11))
+        for other in (
+            note_fingerprint(2, ["AAA"], [10.0], 11.0),
+            note_fingerprint(1, ["AAB"], [10.0], 11.0),
+            note_fingerprint(1, ["AAA"], [10.01], 11.0),
+            note_fingerprint(1, ["AAA"], [10.0], 11.5),
+            note_fingerprint(1, ["AAA"], [10.0], 11.0, mode="cents"),
+        ):
+            self.assertNotEqual(base, other)
+
+    def test_digest_set_persists_and_ignores_torn_tail(self):
+        with DigestSet(self.path) as digests:
+            self.assertTrue(digests.add(b"a" * 16))
+            self.assertFalse(digests.add(b"a" * 16))
+            digests.add(b"b" * 16)
+        with open(self.path, "ab") as handle:
+            handle.write(b"partial")
+
+        reopened = DigestSet(self.path)
+        self.assertEqual(len(reopened), 2)
+        self.assertIn(b"b" * 16, reopened)
+        reopened.add(b"c" * 16)
+        reopened.close()
+        self.assertEqual(len(DigestSet(self.path)), 3)
+
+    def run_batch(self, notes):
+        checkpoint = Checkpoint(self.path, commit_every=2)
+        done = []
+        for note_id, result, error in calculate_notes(checkpoint.pending(notes)):
+            if error is None:
+                done.append(note_id)
+            if checkpoint.completed(error is None):
+                checkpoint.commit()
+        checkpoint.commit()
+        return done, checkpoint.skipped
+
+    def test_rerun_only_processes_new_or_changed_notes(self):
+        notes = make_notes([1, 2, 3, 4, 5])
+        notes.append((5, {"custo_total": 1, "items": [{"ticker": "X", "valor": 0}]}))
+        self.assertEqual(self.run_batch(notes), ([0, 1, 2, 3, 4], 0))
+
+        notes[2] = (2, {"custo_total": 30, "items": notes[2][1]["items"]})
+        notes.append((6, notes[0][1]))
+        self.assertEqual(self.run_batch(notes), ([2, 6], 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from src.utils.calcula import calculate
+from src.utils.consolidate import CONSOLIDATED_FIELDS, Consolidation, consolidate, iter_consolidated_rows
+
+
+class TestConsolidate(unittest.TestCase):
+    def test_aggregates_notes_by_ticker(self):
+        notes = [
+            (["AAA", "BBB"], [100.0, 300.0], 404.0),
+            (["BBB", "CCC", "BBB"], [50.0, 100.0, 50.0], 206.0),
+        ]
+        result = consolidate(notes)
+
+        self.assertEqual(list(result), ["AAA", "BBB", "CCC"])
+        self.assertEqual(result["BBB"]["notes"], 2)
+        self.assertEqual(result["BBB"]["value"], 400.0)
+        self.assertEqual(result["BBB"]["cost"], 3.0 + 3.0)
+        self.assertAlmostEqual(result["BBB"]["cost_share"], 6.0 / 10.0)
+        self.assertAlmostEqual(result["CCC"]["cost_rate"], 0.03)
+        self.assertAlmostEqual(sum(data["cost_share"] for data in result.values()), 1.0)
+
+    def test_dict_and_compact_results_agree(self):
+        from_dicts = Consolidation()
+        from_dicts.add(calculate(["AAA", "BBB"], [1.0, 2.0], 3.1, mode="cents"))
+        expected = consolidate([(["AAA", "BBB"], [1.0, 2.0], 3.1)], mode="cents")
+        self.assertEqual(from_dicts.result(), expected)
+        self.assertEqual(from_dicts.notes, 1)
+
+        rows = list(iter_consolidated_rows(expected))
+        self.assertEqual(tuple(rows[0]), CONSOLIDATED_FIELDS)
+
+    def test_zero_value_note_raises(self):
+        with self.assertRaises(ValueError):
+            consolidate([(["AAA"], [0.0], 1.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
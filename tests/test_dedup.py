@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+
+from src.utils.dedup import NoteIndex, note_signature
+
+
+def note(cost, *items):
+    return {"custo_total": cost, "items": [{"ticker": ticker, "valor": value} for ticker, value in items]}
+
+
+class TestNoteSignature(unittest.TestCase):
+    def test_same_content_in_any_order(self):
+        base = note_signature(note(10, ("AAA", 100), ("BBB", 200)))
+        self.assertEqual(base, note_signature(note("10.00", ("bbb ", "200.00"), ("AAA", 100.001))))
+        for other in (
+            note(10.01, ("AAA", 100), ("BBB", 200)),
+            note(10, ("AAA", 200), ("BBB", 100)),
+            note(10, ("AAA", 100), ("BBB", 200), ("CCC", 0)),
+            {"custos": {"corretagem": 10}, "items": [{"ticker": "AAA", "valor": 100}, {"ticker": "BBB", "valor": 200}]},
+        ):
+            self.assertNotEqual(base, note_signature(other))
+
+
+class TestNoteIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "notas.dedup")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_drops_duplicates_and_passes_malformed_notes_through(self):
+        notes = [
+            (1, note(10, ("AAA", 100), ("BBB", 200))),
+            (2, note(10, ("BBB", 200), ("AAA", 100))),
+            (3, {"items": []}),
+            (4, {"items": []}),
+            (5, note(5, ("AAA", 100))),
+        ]
+        index = NoteIndex()
+        self.assertEqual([note_id for note_id, _ in index.unique(notes)], [1, 3, 4, 5])
+        self.assertEqual((index.dropped, len(index)), (1, 2))
+
+    def test_invalid_copy_does_not_hide_a_valid_one(self):
+        notes = [(1, note(10, ("AAA", "1.500,00"))), (2, note(10, ("AAA", 1500)))]
+        index = NoteIndex()
+        self.assertEqual([note_id for note_id, _ in index.unique(notes)], [1, 2])
+        self.assertEqual((index.dropped, len(index)), (0, 1))
+
+    def test_index_file_persists_only_completed_runs(self):
+        first = [(1, note(10, ("AAA", 100)))]
+        second = [("a", note(10, ("AAA", 100))), ("b", note(20, ("AAA", 100)))]
+        with self.assertRaises(RuntimeError):
+            with NoteIndex(self.path) as index:
+                list(index.unique(first))
+                raise RuntimeError("falhou")
+        with NoteIndex(self.path) as index:
+            self.assertEqual(len(list(index.unique(first))), 1)
+
+        with NoteIndex(self.path) as index:
+            self.assertEqual([note_id for note_id, _ in index.unique(second)], ["b"])
+            self.assertEqual(index.dropped, 1)
+        self.assertEqual(len(NoteIndex(self.path)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import argparse
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import generate_chart
+
+try:
+    import plotly
+except ImportError:  # plotly is only needed by the default renderer
+    plotly = None
+
+
+class TestBuildChartData(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "custo_total": 250,
+            "items": [
+                {"ticker": "PETR4", "valor": 1500},
+                {"ticker": "VALE3", "valor": 2500},
+                {"ticker": "ITUB4", "valor": 3000},
+                {"ticker": "BBAS3", "valor": 1000},
+            ],
+        }
+
+    def test_items_sorted_by_value_with_percent_and_cost(self):
+        chart_data = generate_chart.build_chart_data(self.data)
+
+        self.assertEqual([item["ticker"] for item in chart_data["items"]], ["ITUB4", "VALE3", "PETR4", "BBAS3"])
+        self.assertEqual(chart_data["items"][0], {"ticker": "ITUB4", "value": 3000.0, "percent": 37.5, "cost": 93.75})
+
+    def test_top_n_groups_the_tail_into_others(self):
+        chart_data = generate_chart.build_chart_data(self.data, top_n=2)
+
+        self.assertEqual(
+            chart_data["items"][-1],
+            {"ticker": generate_chart.OTHERS_LABEL, "value": 2500.0, "percent": 31.25, "cost": 78.13},
+        )
+        self.assertEqual([item["ticker"] for item in chart_data["items"][:2]], ["ITUB4", "VALE3"])
+
+
+    def test_cost_components_are_broken_down_per_item(self):
+        data = {"custos": {"corretagem": 200, "emolumentos": 50}, "items": self.data["items"]}
+        chart_data = generate_chart.build_chart_data(data, top_n=2)
+
+        self.assertEqual(chart_data["custo_total"], 250.0)
+        self.assertEqual(chart_data["items"][0]["costs"], {"corretagem": 75.0, "emolumentos": 18.75})
+        self.assertEqual(chart_data["items"][-1]["costs"], {"corretagem": 62.5, "emolumentos": 15.63})
+
+
+class TestRenderChartSvg(unittest.TestCase):
+    def test_writes_bars_and_labels_as_svg(self):
+        data = {"custo_total": 10, "items": [{"ticker": "AAA", "valor": 300}, {"ticker": "BBB", "valor": 100}]}
+        chart_data = generate_chart.build_chart_data(data)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "chart.svg"
+            generate_chart.render_chart_svg(chart_data, output, 1400, 520)
+            root = ET.parse(output).getroot()
+
+        ns = {"svg": "http://www.w3.org/2000/svg"}
+        bars = root.findall("svg:rect", ns)[1:]
+        texts = [text.text for text in root.findall("svg:text", ns)]
+        self.assertEqual([bar.get("fill") for bar in bars], generate_chart.BAR_COLORS[:2])
+        self.assertGreater(float(bars[0].get("width")), float(bars[1].get("width")))
+        self.assertIn("AAA (R$ 300)", texts)
+        self.assertIn("75,00% -> Custo: R$ 7,50", texts)
+
+
+class TestGenerateMany(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.inputs = self.root / "notas"
+        self.inputs.mkdir()
+        for name, cost in (("a", 10), ("b", 20), ("c", 30)):
+            data = {"custo_total": cost, "items": [{"ticker": "AAA", "valor": 300}, {"ticker": "BBB", "valor": 100}]}
+            (self.inputs / f"{name}.json").write_text(json.dumps(data), encoding="utf-8")
+        (self.inputs / "vazia.json").write_text('{"items": []}', encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resolve_inputs_from_file_directory_and_glob(self):
+        single = self.inputs / "a.json"
+        self.assertEqual(generate_chart.resolve_inputs(single), [single])
+        self.assertEqual([path.name for path in generate_chart.resolve_inputs(self.inputs)],
+                         ["a.json", "b.json", "c.json", "vazia.json"])
+        self.assertEqual([path.name for path in generate_chart.resolve_inputs(self.inputs / "[ab].json")],
+                         ["a.json", "b.json"])
+        with self.assertRaises(SystemExit):
+            generate_chart.resolve_inputs(self.inputs / "*.csv")
+
+    def test_renders_every_file_over_a_worker_pool(self):
+        args = argparse.Namespace(
+            output_dir=self.root / "charts", workers=2, backend="svg", width=800, height=300, top=None,
+            no_cache=False, cache_dir=self.root / "cache", cache_max_mb=1,
+        )
+        inputs = generate_chart.resolve_inputs(self.inputs)
+        for expected_hits in (0, 3):
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr):
+                failures = generate_chart.generate_many(args, inputs)
+            report = stderr.getvalue()
+
+            self.assertEqual(failures, 1)
+            self.assertEqual(sorted(path.name for path in args.output_dir.iterdir()), ["a.svg", "b.svg", "c.svg"])
+            self.assertEqual(report.count("(cache)"), expected_hits)
+            self.assertIn("vazia.json", report)
+            self.assertIn("3/4 gráficos em", report)
+        self.assertIn("Custo: R$ 22,50", (args.output_dir / "c.svg").read_text(encoding="utf-8"))
+
+    def test_inputs_with_the_same_name_are_rejected(self):
+        other = self.root / "outras"
+        other.mkdir()
+        (other / "a.json").write_text((self.inputs / "a.json").read_text(encoding="utf-8"), encoding="utf-8")
+        args = argparse.Namespace(output_dir=self.root / "charts", workers=1, backend="svg")
+        with self.assertRaises(SystemExit) as ctx:
+            generate_chart.generate_many(args, [self.inputs / "a.json", other / "a.json"])
+        self.assertIn("rename one of them", str(ctx.exception))
+        self.assertFalse(args.output_dir.exists())
+
+    def test_another_backend_misses_the_cache(self):
+        args = argparse.Namespace(
+            data=self.inputs / "a.json", output=self.root / "a.svg", backend="svg", width=800, height=300,
+            top=None, no_cache=False, cache_dir=self.root / "cache", cache_max_mb=1,
+        )
+        self.assertFalse(generate_chart.generate(args))
+        self.assertTrue(generate_chart.generate(args))
+
+        def fake_render(chart_data, output_path, width, height):
+            output_path.write_text("<svg>plotly</svg>", encoding="utf-8")
+
+        args.backend = "plotly"
+        with mock.patch.dict(generate_chart.RENDERERS, {"plotly": fake_render}):
+            self.assertFalse(generate_chart.generate(args))
+        self.assertEqual(args.output.read_text(encoding="utf-8"), "<svg>plotly</svg>")
+
+
+@unittest.skipIf(plotly is None, "plotly is not installed")
+class TestStartRenderer(unittest.TestCase):
+    def test_kaleido_sync_server_runs_for_the_whole_batch(self):
+        calls = []
+        kaleido = types.SimpleNamespace(
+            start_sync_server=lambda **kwargs: calls.append("start"),
+            stop_sync_server=lambda **kwargs: calls.append("stop"),
+        )
+        with mock.patch.dict(sys.modules, {"kaleido": kaleido}):
+            stop = generate_chart._start_renderer("plotly")
+            self.assertEqual(calls, ["start"])
+            stop()
+        self.assertEqual(calls, ["start", "stop"])
+        generate_chart._start_renderer("svg")()
@@ -0,0 +1,35 @@
+import os
+import tempfile
+import unittest
+
+from src.utils.calcula import calculate, calculate_compact
+from src.utils.ledger import Ledger
+
+
+class TestLedger(unittest.TestCase):
+    def test_positions_aggregate_across_notes(self):
+        ledger = Ledger(batch_size=2)
+        ledger.add(calculate(["AAA", "BBB"], [100.0, 200.0], 350.0), date="2026-01-10", note_id=1)
+        ledger.add(calculate_compact(["AAA"], [50.0], 51.0), date="2026-02-01", note_id=2)
+        ledger.record(calculate(["BBB"], [10.0], 10.0), date="2026-01-05", note_id=3)
+
+        aaa = ledger.position("AAA")
+        self.assertEqual(aaa["entries"], 2)
+        self.assertAlmostEqual(aaa["total_value_cost"], 116.67 + 51.0)
+        self.assertAlmostEqual(aaa["cost_rate"], (16.67 + 1.0) / 150.0)
+        self.assertEqual(aaa["last_date"], "2026-02-01")
+        self.assertEqual(ledger.position("BBB")["last_date"], "2026-01-10")
+        self.assertIsNone(ledger.position("CCC"))
+        self.assertEqual([row[:2] for row in ledger.history("BBB")], [("2026-01-05", "3"), ("2026-01-10", "1")])
+        self.assertEqual(len(ledger.history("AAA", start="2026-01-15")), 1)
+
+    def test_average_price_uses_recorded_quantities_and_persists(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ledger.db")
+            with Ledger(path) as ledger:
+                ledger.record(calculate(["PETR4"], [1000.0], 1010.0), quantities={"PETR4": 100})
+                ledger.add(calculate(["PETR4"], [2000.0], 2020.0), quantities={"PETR4": 100})
+
+            with Ledger(path) as ledger:
+                self.assertAlmostEqual(ledger.average_price("PETR4"), 3030.0 / 200)
+                self.assertIsNone(ledger.average_price("VALE3"))
@@ -0,0 +1,78 @@
+import random
+import unittest
+
+from src.utils.calcula import calculate
+from src.utils.note import Note
+
+
+class TestNote(unittest.TestCase):
+    def test_edits_match_a_full_recalculation(self):
+        rng = random.Random(11)
+        note = Note(total_grade=0.0)
+        reference = {}
+        for i in range(200):
+            value = round(rng.uniform(1, 1_000), 2)
+            note.add_asset(f"T{i}", value)
+            reference[f"T{i}"] = value
+        for _ in range(500):
+            ticker = rng.choice(list(reference))
+            if rng.random() < 0.2 and len(reference) > 1:
+                note.remove_asset(ticker)
+                del reference[ticker]
+            else:
+                reference[ticker] = round(rng.uniform(1, 1_000), 2)
+                note.update_value(ticker, reference[ticker])
+        total_grade = round(sum(reference.values()) + 123.45, 2)
+        note.set_total(total_grade)
+
+        expected = calculate(list(reference), list(reference.values()), total_grade)
+        for ticker in reference:
+            self.assertAlmostEqual(note.cost(ticker), expected[ticker]['cost'], places=2)
+        self.assertEqual(note.result(), expected)
+        self.assertAlmostEqual(note.total_value, sum(reference.values()), places=6)
+
+    def test_cost_equals_result_after_edits_with_large_values(self):
+        rng = random.Random(7)
+        for trial in range(300):
+            note = Note(total_grade=0.0)
+            for i in range(rng.randint(2, 12)):
+                note.add_asset(f"T{i}", round(rng.uniform(1, 1e12), 2))
+            for _ in range(rng.randint(1, 20)):
+                ticker = rng.choice(list(note))
+                if rng.random() < 0.2 and len(note) > 1:
+                    note.remove_asset(ticker)
+                else:
+                    note.update_value(ticker, round(rng.uniform(1, 1e12), 2))
+                    note.cost(ticker)
+            note.set_total(round(note.total_value * 1.0003, 2))
+            costs = {ticker: note.cost(ticker) for ticker in note}
+            with self.subTest(trial=trial):
+                self.assertEqual(costs, {ticker: data['cost'] for ticker, data in note.result().items()})
+
+    def test_cents_mode_result_is_cached_until_the_next_edit(self):
+        note = Note(total_grade=301.0, mode="cents")
+        for ticker in ("AAA", "BBB", "CCC"):
+            note.add_asset(ticker, 100.0)
+
+        self.assertIs(note.result(), note.result())
+        self.assertEqual(note.cost("AAA"), 0.34)
+        note.remove_asset("AAA")
+        self.assertEqual(note["BBB"]['cost'], 50.5)
+
+    def test_cost_components_follow_edits(self):
+        note = Note()
+        note.add_asset("AAA", 100.0)
+        note.set_components({"corretagem": 2.0, "iss": 0.2})
+        self.assertEqual(note.total_grade, 102.2)
+        note.add_asset("BBB", 100.0)
+        self.assertEqual(note["BBB"]["costs"], {"corretagem": 1.0, "iss": 0.1})
+        self.assertEqual(note.cost("AAA"), 1.1)
+        note.set_total(210.0)
+        self.assertIsNone(note.components)
+        self.assertEqual(note.cost("AAA"), 5.0)
+
+    def test_duplicate_ticker_raises(self):
+        note = Note()
+        note.add_asset("AAA", 1.0)
+        with self.assertRaises(ValueError):
+            note.add_asset("AAA", 2.0)
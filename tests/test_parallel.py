@@ -0,0 +1,27 @@
+import unittest
+
+from src.utils.parallel import ParallelStats, chunked, run_parallel
+from src.utils.streams import calculate_notes
+
+
+def make_notes(count):
+    return [
+        (i, {"custo_total": i % 7, "items": [{"ticker": "AAA", "valor": 100 + i}, {"ticker": "BBB", "valor": 200}]})
+        for i in range(count)
+    ]
+
+
+class TestParallel(unittest.TestCase):
+    def test_chunked_splits_lazily(self):
+        self.assertEqual(list(chunked(range(5), 2)), [[0, 1], [2, 3], [4]])
+
+    def test_results_match_serial_and_keep_input_order(self):
+        notes = make_notes(50) + [(50, {"custo_total": 1, "items": [{"ticker": "X", "valor": 0}]})]
+        stats = ParallelStats()
+
+        parallel = list(run_parallel(notes, workers=2, chunk_size=7, stats=stats))
+
+        self.assertEqual(parallel, list(calculate_notes(notes)))
+        self.assertEqual(parallel[-1][2], "Total value of inputs cannot be zero.")
+        self.assertEqual(stats.notes, 51)
+        self.assertIn("total:", stats.summary())
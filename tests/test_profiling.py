@@ -0,0 +1,56 @@
+import os
+import pstats
+import tempfile
+import unittest
+
+from src.utils.profiling import Profiler
+
+
+class TestProfiler(unittest.TestCase):
+    def test_disabled_profiler_records_nothing(self):
+        profiler = Profiler()
+        items = [1, 2, 3]
+        with profiler.stage("calculate"):
+            profiler.count("notes")
+        self.assertIs(profiler.stage("a"), profiler.stage("b"))
+        self.assertIs(profiler.iterate("read", items), items)
+        self.assertEqual((profiler.stages, profiler.counters), ({}, {}))
+
+    def test_stages_counters_and_dump(self):
+        profiler = Profiler()
+        with tempfile.TemporaryDirectory() as tmp:
+            dump = os.path.join(tmp, "run.prof")
+            profiler.enable(dump)
+            for _ in range(3):
+                with profiler.stage("calculate"):
+                    sum(range(1000))
+            self.assertEqual(list(profiler.iterate("read", range(4))), [0, 1, 2, 3])
+            profiler.count("rows", 5)
+            report = profiler.finish()
+
+            self.assertEqual(profiler.stages["calculate"][0], 3)
+            self.assertEqual(profiler.stages["read"][0], 5)
+            self.assertEqual(profiler.counters, {"rows": 5})
+            self.assertIn("calculate", report)
+            self.assertGreater(pstats.Stats(dump).total_calls, 0)
+
+    def test_nested_stages_are_marked_instead_of_sharing_wall_time(self):
+        profiler = Profiler()
+        profiler.enable()
+        with profiler.stage("render"):
+            with profiler.stage("format_brl"):
+                sum(range(1000))
+        with profiler.stage("format_brl"):
+            pass
+        with profiler.stage("write"):
+            pass
+        lines = {line.split()[0]: line for line in profiler.report().splitlines()[1:]}
+
+        self.assertEqual(profiler.stages["format_brl"][2], 1)
+        self.assertTrue(lines["format_brl"].endswith("nested"))
+        shares = [float(lines[name].split()[-1].rstrip("%")) for name in ("render", "write")]
+        self.assertLessEqual(sum(shares), 100.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
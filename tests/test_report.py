@@ -0,0 +1,63 @@
+import io
+import unittest
+
+try:
+    from rich.console import Console
+except ImportError:  # rich is only needed by the interactive report
+    Console = None
+
+from src.utils.brl import format_brl
+from src.utils.calcula import COST_COMPONENTS, calculate_components, calculate_compact
+
+
+@unittest.skipIf(Console is None, "rich is not installed")
+class TestPrintReport(unittest.TestCase):
+    def render(self, rows, total_grade, page_size, components=(), width=120, emoji=False):
+        from src.utils.report import print_report
+
+        output = io.StringIO()
+        console = Console(file=output, width=width, emoji=emoji, color_system=None)
+        totals = print_report(console, rows, total_grade, page_size, components)
+        return totals, output.getvalue()
+
+    def test_pages_and_footer_with_rounding_residual(self):
+        result = calculate_compact(["AAA", "BBB", "CCC"], [100.0, 100.0, 100.0], 300.10)
+        totals, text = self.render(result.rows(), 300.10, page_size=2)
+
+        self.assertEqual(totals.rows, 3)
+        self.assertAlmostEqual(totals.cost, 0.09)
+        self.assertEqual(totals.residual(300.10), 0.01)
+        self.assertEqual(text.count("Relatório de Custos"), 2)
+        self.assertIn("(página 2)", text)
+        self.assertEqual(text.count("Total (3 ativos)"), 1)
+        self.assertIn("Resíduo de arredondamento: R$ 0,01", text)
+
+    def test_exact_pages_and_lazy_rows(self):
+        result = calculate_compact(["AAA", "BBB", "CCC", "DDD"], [1.0, 2.0, 3.0, 4.0], 10.0, mode="cents")
+        totals, text = self.render(iter(result.rows()), 10.0, page_size=2)
+        self.assertEqual(text.count("Relatório de Custos"), 2)
+        self.assertEqual(totals.residual(10.0), 0.0)
+
+        totals, text = self.render(result.rows(), None, page_size=0)
+        self.assertEqual(text.count("Relatório de Custos"), 1)
+        self.assertNotIn("Resíduo", text)
+
+    def test_components_fit_in_80_columns(self):
+        components = {"corretagem": 12345.67, "emolumentos": 1234.56, "taxa_liquidacao": 987.65, "iss": 617.28}
+        self.assertEqual(tuple(components), COST_COMPONENTS)
+        result = calculate_components(["PETR4", "VALE3", "ITUB4"], [1234567.89, 987654.32, 55555.55], components)
+        total_grade = sum(result.values) + sum(components.values())
+        # Rendered like the interactive console, emoji included.
+        totals, text = self.render(result.breakdown_rows(), total_grade, 2, COST_COMPONENTS, width=80, emoji=True)
+
+        self.assertNotIn("…", text)
+        for row in result.breakdown_rows():
+            for amount in row[1:]:
+                self.assertIn(format_brl(amount), text)
+        for amount in (totals.value, totals.cost, totals.value_cost, *totals.components):
+            self.assertIn(format_brl(amount), text)
+        self.assertEqual(text.count("Custos por Componente"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
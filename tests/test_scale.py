@@ -0,0 +1,211 @@
+"""
+Scale and differential tests of the allocation engines.
+
+Random notes of several shapes (skewed values, zero and negative costs,
+repeated tickers) are checked against the allocation invariants, every engine
+is compared with `calculate`, and each size class must finish within a time
+budget that grows linearly with the number of assets, so a change that makes
+an engine quadratic fails here long before it reaches a real note.
+
+The million-asset class takes several seconds per engine and only runs with
+``CDA_SCALE_TESTS=full``.
+"""
+import os
+import random
+import time
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency of the batch engine
+    np = None
+
+from src.utils.calcula import MODES, calculate, calculate_compact, merge_duplicates, to_cents
+from src.utils.note import Note
+
+if np is not None:
+    from src.utils.batch import calculate_batch
+
+SHAPES = ("uniform", "skewed", "duplicates", "zero_cost", "negative_cost")
+SIZE_CLASSES = (1, 10, 1_000, 100_000)
+if os.environ.get("CDA_SCALE_TESTS") == "full":
+    SIZE_CLASSES += (1_000_000,)
+# Budget of one engine call: a fixed allowance plus a per-asset cost about
+# ten times what the pure-Python engines need on a slow machine.
+BASE_BUDGET = 0.05
+ASSET_BUDGET = 40e-6
+
+
+def random_note(rng: random.Random, size: int, shape: str) -> tuple:
+    """
+    Build a random note with ``size`` asset lines.
+
+    Args:
+        rng (random.Random): Seeded generator.
+        size (int): Number of asset lines.
+        shape (str): One of `SHAPES`.
+
+    Returns:
+        tuple: ``(tickers, values, total_grade)`` with values in whole cents.
+    """
+    if shape == "duplicates":
+        pool = max(size // 3, 1)
+        tickers = [f"T{rng.randrange(pool)}" for _ in range(size)]
+    else:
+        tickers = [f"T{i}" for i in range(size)]
+    if shape == "skewed":
+        # One large position among many tiny ones, spanning eleven orders of magnitude.
+        values = [round(min(rng.lognormvariate(0, 3), 1e6), 2) + 0.01 for _ in tickers]
+        values[rng.randrange(size)] = 1e9
+    else:
+        values = [round(rng.uniform(0.01, 10_000), 2) for _ in tickers]
+    total_value = sum(values)
+    if shape == "zero_cost":
+        return tickers, values, total_value
+    if shape == "negative_cost":
+        return tickers, values, round(total_value - rng.uniform(0.01, 0.05 * total_value), 2)
+    return tickers, values, round(total_value + rng.uniform(0, 10 + size), 2)
+
+
+ENGINES = {
+    "calculate": lambda note, mode: calculate(*note, mode=mode),
+    "calculate_compact": lambda note, mode: calculate_compact(*note, mode=mode),
+}
+
+
+def note_engine(note: tuple, mode: str) -> dict:
+    tickers, values, total_grade = note
+    edited = Note(total_grade, mode=mode)
+    for ticker, value in zip(*merge_duplicates(tickers, values)):
+        edited.add_asset(ticker, value)
+    return edited.result()
+
+
+ENGINES["Note"] = note_engine
+
+
+class ScaleTestCase(unittest.TestCase):
+    def assertAllocationInvariants(self, note: tuple, mode: str, result) -> None:
+        """Check a result against the properties every allocation must have."""
+        tickers, values, total_grade = merge_duplicates(*note[:2]) + (note[2],)
+        self.assertEqual(list(result), tickers)
+        total_value = sum(values)
+        total_cost = total_grade - total_value
+        costs = []
+        for ticker, value in zip(tickers, values):
+            data = result[ticker]
+            share = value / total_value
+            self.assertTrue(0 <= share <= 1)
+            # Each cost has the sign of the note cost and never exceeds it.
+            self.assertGreaterEqual(data['cost'] * total_cost, 0)
+            self.assertLessEqual(abs(data['cost']), abs(total_cost) + 0.01)
+            self.assertAlmostEqual(data['value_cost'], data['value'] + data['cost'], delta=0.0051)
+            costs.append(data['cost'])
+
+        if mode == "cents":
+            cost_cents = [to_cents(cost) for cost in costs]
+            total_cents = to_cents(total_grade) - sum(to_cents(value) for value in values)
+            self.assertEqual(sum(cost_cents), total_cents)
+            for cents, value in zip(cost_cents, values):
+                self.assertLess(abs(cents - total_cents * value / total_value), 1 + 1e-6)
+        else:
+            # Each float share is off by at most half a cent, so the residual is bounded by the row count.
+            self.assertLessEqual(abs(sum(costs) - total_cost), 0.005 * len(costs) + 1e-6)
+
+
+class TestInvariants(ScaleTestCase):
+    def test_random_notes_of_every_shape(self):
+        rng = random.Random(2024)
+        for shape in SHAPES:
+            for size in (1, 2, 3, 17, 250, 1_000):
+                note = random_note(rng, size, shape)
+                for mode in MODES:
+                    for name, engine in ENGINES.items():
+                        with self.subTest(shape=shape, size=size, mode=mode, engine=name):
+                            self.assertAllocationInvariants(note, mode, engine(note, mode))
+
+    def test_zero_total_value_raises_in_every_engine(self):
+        for values in ([0.0], [0.0, 0.0, 0.0], [150.0, -150.0]):
+            note = ([f"T{i}" for i in range(len(values))], values, 10.0)
+            for mode in MODES:
+                for name, engine in ENGINES.items():
+                    with self.subTest(values=values, mode=mode, engine=name):
+                        with self.assertRaises(ValueError):
+                            engine(note, mode)
+            if np is not None:
+                with self.assertRaises(ValueError):
+                    calculate_batch([0] * len(values), values, [10.0])
+
+
+class TestDifferential(ScaleTestCase):
+    def test_engines_match_calculate(self):
+        rng = random.Random(99)
+        for trial in range(300):
+            note = random_note(rng, rng.randint(1, 60), SHAPES[trial % len(SHAPES)])
+            for mode in MODES:
+                expected = calculate(*note, mode=mode)
+                with self.subTest(trial=trial, mode=mode):
+                    self.assertEqual(calculate_compact(*note, mode=mode).to_dict(), expected)
+                    self.assertEqual(note_engine(note, mode).to_dict(), expected)
+
+    def test_note_single_asset_cost_matches_calculate(self):
+        rng = random.Random(5)
+        for trial in range(100):
+            note = random_note(rng, rng.randint(1, 40), SHAPES[trial % len(SHAPES)])
+            expected = calculate(*note)
+            edited = Note(note[2])
+            for ticker, value in zip(*merge_duplicates(*note[:2])):
+                edited.add_asset(ticker, value)
+            with self.subTest(trial=trial):
+                self.assertEqual({ticker: edited.cost(ticker) for ticker in edited},
+                                 {ticker: data['cost'] for ticker, data in expected.items()})
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_batch_matches_calculate(self):
+        rng = random.Random(11)
+        notes = [random_note(rng, rng.randint(1, 60), SHAPES[trial % len(SHAPES)]) for trial in range(200)]
+        merged = [merge_duplicates(*note[:2]) + (note[2],) for note in notes]
+        result = calculate_batch(
+            [index for index, note in enumerate(merged) for _ in note[1]],
+            [value for note in merged for value in note[1]],
+            [note[2] for note in merged],
+        )
+        row = 0
+        for note in merged:
+            for data in calculate(*note).values():
+                self.assertEqual(result['cost'][row], data['cost'])
+                self.assertEqual(result['value_cost'][row], data['value_cost'])
+                row += 1
+
+
+class TestTimeBudget(ScaleTestCase):
+    def run_within_budget(self, size: int, name: str, call):
+        start = time.perf_counter()
+        result = call()
+        elapsed = time.perf_counter() - start
+        budget = BASE_BUDGET + ASSET_BUDGET * size
+        self.assertLessEqual(elapsed, budget, f"{name} took {elapsed:.3f}s for {size} assets (budget {budget:.3f}s)")
+        return result
+
+    def test_every_size_class_within_budget(self):
+        rng = random.Random(1)
+        for index, size in enumerate(SIZE_CLASSES):
+            shape = SHAPES[index % len(SHAPES)]
+            note = random_note(rng, size, shape)
+            for mode in MODES:
+                for name, engine in ENGINES.items():
+                    with self.subTest(size=size, shape=shape, mode=mode, engine=name):
+                        result = self.run_within_budget(size, name, lambda: engine(note, mode))
+                        self.assertAllocationInvariants(note, mode, result)
+            if np is not None:
+                tickers, values = merge_duplicates(*note[:2])
+                with self.subTest(size=size, shape=shape, engine="calculate_batch"):
+                    result = self.run_within_budget(
+                        size, "calculate_batch", lambda: calculate_batch([0] * len(values), values, [note[2]])
+                    )
+                    self.assertLessEqual(abs(float(result['cost'].sum()) - (note[2] - sum(values))),
+                                         0.005 * len(values) + 1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
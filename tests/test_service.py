@@ -0,0 +1,109 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from src.utils.calcula import calculate
+from src.utils.service import CalculationService, MicroBatcher, percentile
+
+NOTE = {"custo_total": 250, "items": [
+    {"ticker": "PETR4", "valor": 1500}, {"ticker": "VALE3", "valor": 2500},
+    {"ticker": "ITUB4", "valor": 3000}, {"ticker": "BBAS3", "valor": 1000},
+]}
+
+
+async def request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b"" if payload is None else json.dumps(payload).encode()
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+class TestCalculationService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.service = CalculationService(port=0, window=0.05)
+        await self.service.start()
+
+    async def asyncTearDown(self):
+        await self.service.stop()
+
+    async def test_concurrent_requests_are_batched(self):
+        notes = [
+            {"custo_total": i, "items": [{"ticker": "aaa", "valor": 100 + i}, {"ticker": "BBB", "valor": 200}]}
+            for i in range(10)
+        ]
+        responses = await asyncio.gather(*(request(self.service.port, "POST", "/calculate", n) for n in notes))
+
+        for (status, body), note in zip(responses, notes):
+            self.assertEqual(status, 200)
+            values = [item["valor"] for item in note["items"]]
+            self.assertEqual(body, calculate(["AAA", "BBB"], values, sum(values) + note["custo_total"]))
+
+        status, metrics = await request(self.service.port, "GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertEqual(metrics["requests"], 10)
+        self.assertLess(metrics["batches"]["count"], 10)
+        self.assertGreater(metrics["batches"]["max_size"], 1)
+        self.assertGreater(metrics["latency_ms"]["p99"], 0)
+
+    async def test_invalid_notes_fail_alone(self):
+        zero = {"custo_total": 1, "items": [{"ticker": "X", "valor": 0}]}
+        results = await asyncio.gather(
+            request(self.service.port, "POST", "/calculate", NOTE),
+            request(self.service.port, "POST", "/calculate", zero),
+            request(self.service.port, "POST", "/calculate", {"items": []}),
+        )
+        self.assertEqual(results[0], (200, calculate(["PETR4", "VALE3", "ITUB4", "BBAS3"], [1500.0, 2500.0, 3000.0, 1000.0], 8250.0)))
+        self.assertEqual(results[1], (400, {"error": "Total value of inputs cannot be zero."}))
+        self.assertEqual(results[2][0], 400)
+        self.assertEqual((await request(self.service.port, "GET", "/calculate"))[0], 405)
+        self.assertEqual((await request(self.service.port, "GET", "/nope"))[0], 404)
+        self.assertEqual(self.service.metrics.errors, 2)
+
+    async def test_unexpected_errors_answer_500(self):
+        self.service.batcher._calculate_batch = None
+        with mock.patch("src.utils.service.calculate", side_effect=RuntimeError("boom")):
+            status, body = await request(self.service.port, "POST", "/calculate", NOTE)
+        self.assertEqual((status, body), (500, {"error": "boom"}))
+        self.assertEqual((self.service.metrics.requests, self.service.metrics.errors), (1, 1))
+
+
+class TestMicroBatcher(unittest.IsolatedAsyncioTestCase):
+    async def test_calculation_errors_resolve_every_future(self):
+        batcher = MicroBatcher(mode="cents", window=10)
+        huge = {"custo_total": 1, "items": [{"ticker": "X", "valor": 1e308}]}
+        futures = [batcher.submit(NOTE), batcher.submit(huge), batcher.submit(NOTE)]
+        cancelled = batcher.submit(NOTE)
+        cancelled.cancel()
+        batcher.flush()
+
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertEqual(futures[0].result(), futures[2].result())
+        self.assertIsInstance(futures[1].exception(), OverflowError)
+
+    async def test_non_finite_amounts_are_rejected(self):
+        batcher = MicroBatcher(window=10)
+        future = batcher.submit({"custo_total": 1, "items": [{"ticker": "X", "valor": float("inf")}]})
+        batcher.flush()
+        self.assertIsInstance(future.exception(), ValueError)
+
+
+class TestPercentile(unittest.TestCase):
+    def test_nearest_rank(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 0.5), 50)
+        self.assertEqual(percentile(samples, 0.99), 99)
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 0.5), 3)
+        self.assertEqual(percentile([1, 2, 3, 4], 0.5), 2)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.utils.streams import (
+    CSVRowWriter,
+    iter_result_rows,
+    note_from_record,
+    note_quantities,
+    read_csv_notes,
+    read_jsonl_notes,
+)
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+class TestStreams(unittest.TestCase):
+    def test_note_from_record_adds_cost_to_total_grade(self):
+        record = {"custo_total": 50, "items": [{"ticker": "aaa", "valor": 100}, {"ticker": "BBB", "valor": "200"}]}
+        self.assertEqual(note_from_record(record), (["AAA", "BBB"], [100.0, 200.0], 350.0))
+
+    def test_read_csv_groups_consecutive_rows_by_note(self):
+        handle = io.StringIO(
+            "nota,ticker,valor,custo_total\n"
+            "1,AAA,100,50\n"
+            "1,BBB,200,\n"
+            "2,CCC,10,1\n"
+        )
+        notes = list(read_csv_notes(handle))
+        self.assertEqual([note_id for note_id, _ in notes], ["1", "2"])
+        self.assertEqual(note_from_record(notes[0][1]), (["AAA", "BBB"], [100.0, 200.0], 350.0))
+
+    def test_note_quantities_are_optional_and_summed_per_ticker(self):
+        record = {"items": [
+            {"ticker": "aaa", "valor": 100, "quantidade": 10},
+            {"ticker": "BBB", "valor": 200},
+            {"ticker": "AAA", "valor": 50, "quantidade": "5"},
+        ]}
+        self.assertEqual(note_quantities(record), {"AAA": 15.0})
+        self.assertIsNone(note_quantities({"items": [{"ticker": "AAA", "valor": 1}]}))
+        for quantity in ("dez", "nan"):
+            with self.subTest(quantity=quantity), self.assertRaises(ValueError):
+                note_quantities({"items": [{"ticker": "AAA", "valor": 1, "quantidade": quantity}]})
+
+    def test_read_csv_keeps_optional_quantity(self):
+        handle = io.StringIO("nota,ticker,valor,custo_total,quantidade\n1,AAA,100,1,10\n1,BBB,200,,\n")
+        (_, record), = read_csv_notes(handle)
+        self.assertEqual(note_quantities(record), {"AAA": 10.0})
+
+    def test_read_jsonl_uses_line_position_as_default_id(self):
+        handle = io.StringIO('{"custo_total": 1, "items": []}\n\n{"nota": "X", "items": []}\n')
+        self.assertEqual([note_id for note_id, _ in read_jsonl_notes(handle)], [1, "X"])
+
+    def test_csv_writer_outputs_one_row_per_ticker(self):
+        handle = io.StringIO()
+        writer = CSVRowWriter(handle)
+        result = {"AAA": {"value": 100.0, "value_cost": 116.67, "cost": 16.67}}
+        for row in iter_result_rows(1, result):
+            writer.write(row)
+        self.assertEqual(
+            handle.getvalue().splitlines(),
+            ["nota,ticker,value,cost,value_cost", "1,AAA,100.0,16.67,116.67"],
+        )
+
+
+class TestRunBatch(unittest.TestCase):
+    """Runs the batch mode end to end, as ``python -m main`` from ``src``."""
+
+    def run_main(self, name: str, content: str, *extra):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, name)
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(content)
+            return subprocess.run(
+                [sys.executable, "-m", "main", "--input", path, "--output", "-", *extra],
+                cwd=SRC, capture_output=True, text=True, timeout=60,
+            )
+
+    def test_malformed_lines_are_reported_and_skipped(self):
+        valid = {"nota": 9, "custo_total": 1, "items": [{"ticker": "AAA", "valor": 10}]}
+        content = "\n".join(["not json", "[1, 2]", json.dumps(valid), '{"custos": [1], "items": []}']) + "\n"
+        for extra in ((), ("--workers", "2")):
+            with self.subTest(extra=extra):
+                completed = self.run_main("notas.jsonl", content, *extra)
+                self.assertEqual(completed.returncode, 1)
+                rows = [json.loads(line) for line in completed.stdout.splitlines()]
+                self.assertEqual(rows, [{"nota": 9, "ticker": "AAA", "value": 10.0, "cost": 1.0, "value_cost": 11.0}])
+                self.assertIn("nota 1: Invalid JSON", completed.stderr)
+                self.assertIn("nota 2: Note must be an object", completed.stderr)
+                self.assertIn("nota 4:", completed.stderr)
+                self.assertNotIn("Traceback", completed.stderr)
+
+    def test_csv_without_required_columns_is_reported(self):
+        completed = self.run_main("notas.csv", "ticker,valor\nAAA,10\n")
+        self.assertEqual(completed.returncode, 1)
+        self.assertEqual(completed.stdout, "")
+        self.assertIn("missing the columns: nota", completed.stderr)
+        self.assertNotIn("Traceback", completed.stderr)
+
+    def test_ledger_records_quantities(self):
+        from src.utils.ledger import Ledger
+
+        notes = (
+            '{"custo_total": 10, "items": [{"ticker": "AAA", "valor": 1000, "quantidade": 100}, {"ticker": "BBB", "valor": 1000}]}\n'
+            '{"custo_total": 0, "items": [{"ticker": "AAA", "valor": 500, "quantidade": "x"}]}\n'
+        )
+        for workers in ("1", "2"):
+            with self.subTest(workers=workers), tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "carteira.db")
+                completed = self.run_main("notas.jsonl", notes, "--ledger", path, "--workers", workers)
+                self.assertEqual(completed.returncode, 1)
+                self.assertIn("nota 2: could not convert string to float", completed.stderr)
+                with Ledger(path) as ledger:
+                    self.assertAlmostEqual(ledger.average_price("AAA"), 10.05)
+                    self.assertIsNone(ledger.average_price("BBB"))
+                    self.assertEqual(ledger.position("AAA")["quantity"], 100)
+
+    def test_checkpoint_with_consolidate_is_rejected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            completed = self.run_main(
+                "notas.jsonl", "", "--consolidate", "--checkpoint", os.path.join(tmp, "run.digests")
+            )
+        self.assertEqual(completed.returncode, 2)
+        self.assertIn("--checkpoint cannot be combined with --consolidate", completed.stderr)